@@ -1,113 +1,150 @@
 from nfa2dfa import DFA
-from collections import defaultdict
+from collections import defaultdict, deque
+
+# 缺失的转换统一视为进入该虚拟死状态
+DEAD_STATE = object()
 
 class hopcroft_minimization:
-    def __init__(self, dfa):
+    def __init__(self, dfa, labels=None):
+        """
+        :param dfa: 待最小化的DFA
+        :param labels: 可选，{接受状态: 标签}，标签不同的接受状态不会被合并（用于多规则DFA）
+        """
         self.dfa = dfa
+        self.labels = labels
         self.partitions = []
-        
-    def split(self, partition, symbol):
-        """根据输入符号分割状态集合"""
-        transitions = defaultdict(set)
-        
-        # 收集转换信息
-        for state in partition:
-            if state in self.dfa.transitions and symbol in self.dfa.transitions[state]:
-                target = self.dfa.transitions[state][symbol]
-                # 找出目标状态所在的分区
-                target_partition_idx = self._find_partition(target)
-                if target_partition_idx is not None:
-                    transitions[target_partition_idx].add(state)
-        
-        # 如果存在多个不同的转换目标，需要分割
-        if len(transitions) > 1:
-            new_partitions = list(transitions.values())
-            # 添加没有转换的状态
-            remaining = partition - set().union(*new_partitions)
-            if remaining:
-                new_partitions.append(remaining)
-            return new_partitions
-        return [partition]
-    
-    def _find_partition(self, state):
-        """查找状态所在的分区索引"""
-        for i, partition in enumerate(self.partitions):
-            if state in partition:
-                return i
-        return None
-    
+        self.state_map = {}  # 原DFA状态 -> 最小化DFA状态
+
+    def _inverse_transitions(self, states):
+        """构建逆转换表 {符号: {目标状态: {源状态集合}}}，缺失的转换指向死状态"""
+        inverse = {symbol: defaultdict(set) for symbol in self.dfa.alphabet}
+        for state in states:
+            trans = self.dfa.transitions.get(state, {})
+            for symbol in self.dfa.alphabet:
+                inverse[symbol][trans.get(symbol, DEAD_STATE)].add(state)
+        for symbol in self.dfa.alphabet:
+            inverse[symbol][DEAD_STATE].add(DEAD_STATE)
+        return inverse
+
     def minimize(self):
         """执行Hopcroft算法进行DFA最小化"""
-        # 初始分区：接受状态和非接受状态
-        accept = self.dfa.accept_states
-        all_states = set(self.dfa.transitions.keys())
-        for target_dict in self.dfa.transitions.values():
-            for target in target_dict.values():
-                all_states.add(target)
-        non_accept = all_states - accept
-        
-        self.partitions = [accept, non_accept] if non_accept else [accept]
-        
-        # 删除空集
-        self.partitions = [p for p in self.partitions if p]
-        
-        waiting = self.partitions.copy()
-        
+        states = reachable_states(self.dfa)
+        inverse = self._inverse_transitions(states)
+
+        # 初始分区：接受状态和非接受状态（死状态归入非接受状态）；给定标签时接受状态再按标签细分
+        accept = states & self.dfa.accept_states
+        non_accept = (states - accept) | {DEAD_STATE}
+        if self.labels is None:
+            self.partitions = [p for p in (accept, non_accept) if p]
+        else:
+            by_label = defaultdict(set)
+            for state in accept:
+                by_label[self.labels.get(state)].add(state)
+            self.partitions = list(by_label.values()) + [non_accept]
+        block_of = {}
+        for i, partition in enumerate(self.partitions):
+            for state in partition:
+                block_of[state] = i
+
+        # 初始分区中最大的一个不必作为分割器
+        largest = max(range(len(self.partitions)), key=lambda i: len(self.partitions[i]))
+        waiting = deque(i for i in range(len(self.partitions)) if i != largest)
+        in_waiting = set(waiting)
+        symbols = sorted(self.dfa.alphabet)
+
         while waiting:
-            partition = waiting.pop(0)
-            for symbol in self.dfa.alphabet:
-                for p in self.partitions:
-                    split_result = self.split(p, symbol)
-                    if len(split_result) > 1:  # 如果可以分割
-                        # 更新分区和等待集
-                        idx = self.partitions.index(p)
-                        self.partitions.pop(idx)
-                        self.partitions.extend(split_result)
-                        
-                        # 更新waiting列表
-                        if p in waiting:
-                            waiting.remove(p)
-                            waiting.extend(split_result)
-                        else:
-                            # 添加较小的分区到waiting
-                            waiting.append(min(split_result, key=len))
-        
-        return self._construct_minimized_dfa()
-    
-    def _construct_minimized_dfa(self):
-        """构建最小化后的DFA"""
-        min_dfa = DFA(self.dfa.alphabet)
-        
-        # 创建分区到新状态的映射
-        partition_to_state = {
-            frozenset(partition): i 
-            for i, partition in enumerate(self.partitions)
-        }
-        
-        # 设置起始状态
-        for partition in self.partitions:
-            if any(state == self.dfa.start_state for state in partition):
-                min_dfa.start_state = partition_to_state[frozenset(partition)]
-                break
-        
-        # 设置接受状态
-        for partition in self.partitions:
-            if partition & self.dfa.accept_states:
-                min_dfa.accept_states.add(partition_to_state[frozenset(partition)])
-        
-        # 构建转换函数
-        min_dfa.transitions = {}
-        for partition in self.partitions:
-            state_repr = next(iter(partition))  # 选择一个代表状态
-            current_state = partition_to_state[frozenset(partition)]
-            min_dfa.transitions[current_state] = {}
-            
-            if state_repr in self.dfa.transitions:
-                for symbol, target in self.dfa.transitions[state_repr].items():
-                    for p in self.partitions:
-                        if target in p:
-                            min_dfa.transitions[current_state][symbol] = partition_to_state[frozenset(p)]
-                            break
-        
+            splitter_idx = waiting.popleft()
+            in_waiting.discard(splitter_idx)
+            splitter = set(self.partitions[splitter_idx])
+            for symbol in symbols:
+                # 找出经symbol转换进入splitter的所有状态，按所在分区分组
+                touched = defaultdict(set)
+                for target in splitter:
+                    for source in inverse[symbol].get(target, ()):
+                        touched[block_of[source]].add(source)
+
+                for idx, hit in touched.items():
+                    partition = self.partitions[idx]
+                    if len(hit) == len(partition):
+                        continue
+                    # 分割：原索引保留未命中的部分，命中的部分成为新分区
+                    partition -= hit
+                    new_idx = len(self.partitions)
+                    self.partitions.append(hit)
+                    for state in hit:
+                        block_of[state] = new_idx
+
+                    if idx in in_waiting:
+                        waiting.append(new_idx)
+                        in_waiting.add(new_idx)
+                    else:
+                        # 只需把较小的一半加入等待集
+                        smaller = new_idx if len(hit) <= len(partition) else idx
+                        waiting.append(smaller)
+                        in_waiting.add(smaller)
+
+        min_dfa, self.state_map = quotient_dfa(self.dfa, block_of)
         return min_dfa
 
+
+def reachable_states(dfa):
+    """从起始状态出发收集所有可达状态"""
+    reachable = {dfa.start_state}
+    queue = deque([dfa.start_state])
+    while queue:
+        state = queue.popleft()
+        for target in dfa.transitions.get(state, {}).values():
+            if target not in reachable:
+                reachable.add(target)
+                queue.append(target)
+    return reachable
+
+
+def quotient_dfa(dfa, block_of):
+    """
+    根据状态划分构建最小化后的DFA，状态按从起始状态出发的BFS顺序编号
+    :param block_of: {原DFA状态: 分区号}，必须包含DEAD_STATE
+    :return: (最小化DFA, {原DFA状态: 最小化DFA状态})
+    """
+    min_dfa = DFA(dfa.alphabet)
+    dead_block = block_of[DEAD_STATE]
+    symbols = sorted(dfa.alphabet)
+
+    # 每个分区选一个代表状态
+    representative = {}
+    for state, idx in block_of.items():
+        if state is not DEAD_STATE:
+            representative.setdefault(idx, state)
+
+    start_block = block_of[dfa.start_state]
+    partition_to_state = {start_block: 0}
+    queue = deque([start_block])
+    min_dfa.start_state = 0
+    min_dfa.transitions = {}
+
+    while queue:
+        block = queue.popleft()
+        current_state = partition_to_state[block]
+        min_dfa.transitions[current_state] = {}
+        state_repr = representative[block]
+        if state_repr in dfa.accept_states:
+            min_dfa.accept_states.add(current_state)
+
+        # 死状态所在分区不输出转换，保持部分DFA的约定
+        if block == dead_block:
+            continue
+        trans = dfa.transitions.get(state_repr, {})
+        for symbol in symbols:
+            if symbol not in trans:
+                continue
+            target_block = block_of[trans[symbol]]
+            if target_block == dead_block:
+                continue
+            if target_block not in partition_to_state:
+                partition_to_state[target_block] = len(partition_to_state)
+                queue.append(target_block)
+            min_dfa.transitions[current_state][symbol] = partition_to_state[target_block]
+
+    state_map = {state: partition_to_state[idx] for state, idx in block_of.items()
+                 if state is not DEAD_STATE and idx in partition_to_state}
+    return min_dfa, state_map
@@ -0,0 +1,105 @@
+"""
+DFA状态加速：在自环上批量跳过输入，而不是逐字符查转换表
+1. 分析（accelerable_states）：状态s的自环符号集合为loop，其余字母表符号（包括缺失转换，
+   即进入死状态的符号）为exits。
+   exits很少（不超过max_exits个）时用 'find' 方式：分别用str.find找每个出口符号的下一次出现；
+   否则自环符号不少于出口符号时用 'strip' 方式：对输入分段做lstrip(loop)，跳过连续的自环符号
+2. 匹配（AcceleratedDFA）：进入可加速状态时直接跳到下一个出口字符
+   'find' 方式要求跳过的字符都在字母表内，因此匹配前先检查输入只含字母表符号
+   （部分DFA中字母表外的字符在任何状态都进入死状态，含有这种字符的输入一定不匹配）；
+   每个出口符号的下一次出现位置在一次匹配内缓存，总的查找代价与输入长度成线性
+3. 计数器记录跳过的字符占输入字符的比例
+"""
+MAX_EXITS = 3     # 'find' 方式允许的出口符号数上限
+STRIP_WINDOW = 256  # 'strip' 方式每次lstrip的分段长度，避免对长输入反复切片
+
+
+def accelerable_states(dfa, max_exits=MAX_EXITS):
+    """
+    标记DFA中可加速的状态
+    :return: {状态: ('find', 出口符号元组) 或 ('strip', 自环符号组成的字符串)}
+    """
+    result = {}
+    for state, trans in dfa.transitions.items():
+        loop = sorted(symbol for symbol, target in trans.items() if target == state)
+        if not loop:
+            continue
+        exits = sorted(dfa.alphabet - set(loop))
+        if len(exits) <= max_exits:
+            result[state] = ('find', tuple(exits))
+        elif len(loop) >= len(exits) and all(len(symbol) == 1 for symbol in loop):
+            result[state] = ('strip', ''.join(loop))
+    return result
+
+
+class AcceleratedDFA:
+    def __init__(self, dfa, max_exits=MAX_EXITS):
+        """
+        :param dfa: nfa2dfa.DFA（通常是最小化DFA），缺失的转换视为进入死状态
+        :param max_exits: 'find' 方式允许的出口符号数上限
+        """
+        self.dfa = dfa
+        self.accel = accelerable_states(dfa, max_exits)
+        self.alphabet = frozenset(dfa.alphabet)
+        self._needs_alphabet_check = any(kind == 'find' for kind, _ in self.accel.values())
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.inputs = 0
+        self.chars = 0     # 输入字符总数
+        self.skipped = 0   # 通过加速跳过的字符数
+        self.jumps = 0     # 加速跳跃次数
+
+    @property
+    def skip_ratio(self):
+        """通过加速跳过的输入字符比例"""
+        return self.skipped / self.chars if self.chars else 0.0
+
+    def stats(self):
+        return {'inputs': self.inputs, 'chars': self.chars, 'skipped': self.skipped,
+                'jumps': self.jumps, 'skip_ratio': self.skip_ratio}
+
+    def accepts(self, string):
+        """判断DFA是否接受给定字符串"""
+        length = len(string)
+        self.inputs += 1
+        self.chars += length
+        if self._needs_alphabet_check and not self.alphabet.issuperset(string):
+            return False
+
+        transitions, accel = self.dfa.transitions, self.accel
+        next_exit = {}   # 出口符号 -> 其在position之后的下一次出现位置（不存在时为length）
+        state = self.dfa.start_state
+        position = 0
+        while position < length:
+            plan = accel.get(state)
+            if plan is not None:
+                kind, symbols = plan
+                if kind == 'find':
+                    end = length
+                    for symbol in symbols:
+                        found = next_exit.get(symbol, -1)
+                        if found < position:
+                            found = string.find(symbol, position)
+                            next_exit[symbol] = found = length if found < 0 else found
+                        if found < end:
+                            end = found
+                else:
+                    end = position
+                    while end < length:
+                        window = string[end:end + STRIP_WINDOW]
+                        run = len(window) - len(window.lstrip(symbols))
+                        end += run
+                        if run < len(window):
+                            break
+                if end > position:
+                    self.skipped += end - position
+                    self.jumps += 1
+                    position = end
+                    if position == length:
+                        break
+            state = transitions.get(state, {}).get(string[position])
+            if state is None:
+                return False
+            position += 1
+        return state in self.dfa.accept_states
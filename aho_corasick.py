@@ -0,0 +1,101 @@
+"""
+Aho–Corasick自动机：纯字面量规则的快速路径
+1. 所有字面量插入一棵字典树（goto），节点即状态，根为状态0
+2. 按BFS顺序计算失败链接，并把失败转换折叠进一张扁平的稠密转换表：
+   table[state * width + column]，column为符号在字母表中的列号，表用array('i')存储
+3. 每个状态记录以它结尾的规则（own）和沿失败链接最近的有输出状态（output_link）
+
+match与IncrementalDFA.match接口相同（完整匹配，返回规则号集合）：
+沿折叠后的表走到的状态深度等于输入长度，当且仅当整个输入都在字典树上。
+scan在任意位置查找所有出现的字面量，需要失败链接。
+"""
+from array import array
+from collections import deque
+
+ROOT = 0
+
+
+class AhoCorasick:
+    def __init__(self, patterns):
+        """
+        :param patterns: (规则号, 字面量) 序列，同一规则可以有多个字面量，字面量不能为空串
+        """
+        children = [{}]
+        self.depth = [0]
+        self.own = {}   # 状态 -> 以该状态结尾的规则号元组
+        for rule_id, literal in patterns:
+            if not literal:
+                raise ValueError(f"规则{rule_id}的字面量为空串")
+            state = ROOT
+            for char in literal:
+                child = children[state].get(char)
+                if child is None:
+                    child = len(children)
+                    children[state][char] = child
+                    children.append({})
+                    self.depth.append(self.depth[state] + 1)
+                state = child
+            if rule_id not in self.own.get(state, ()):
+                self.own[state] = self.own.get(state, ()) + (rule_id,)
+
+        self.symbols = sorted({char for trans in children for char in trans})
+        self.index = {symbol: column for column, symbol in enumerate(self.symbols)}
+        width = self.width = len(self.symbols)
+        table = self.table = array('i', [ROOT]) * (len(children) * width)
+        fail = [ROOT] * len(children)
+        self.output_link = [ROOT] * len(children)
+
+        queue = deque()
+        for char, child in children[ROOT].items():
+            table[self.index[char]] = child
+            queue.append(child)
+        while queue:
+            state = queue.popleft()
+            # 先继承失败状态的整行转换，再用字典树的边覆盖
+            row = state * width
+            parent_row = fail[state] * width
+            table[row:row + width] = table[parent_row:parent_row + width]
+            for char, child in children[state].items():
+                column = self.index[char]
+                fail[child] = table[parent_row + column]
+                link = fail[child]
+                self.output_link[child] = link if link in self.own else self.output_link[link]
+                table[row + column] = child
+                queue.append(child)
+        self.fail = fail
+
+    @property
+    def states(self):
+        return len(self.depth)
+
+    def match(self, string):
+        """返回完整匹配string的规则号集合"""
+        index, table, width, depth = self.index, self.table, self.width, self.depth
+        state = ROOT
+        for position, char in enumerate(string):
+            column = index.get(char)
+            if column is None:
+                return set()
+            state = table[state * width + column]
+            if depth[state] <= position:
+                return set()   # 经失败链接回退，已离开字典树
+        return set(self.own.get(state, ()))
+
+    def scan(self, string):
+        """
+        查找string中所有字面量的出现（允许重叠）
+        :return: [(开始位置, 结束位置, 规则号)]，按结束位置排序
+        """
+        index, table, width = self.index, self.table, self.width
+        own, output_link, depth = self.own, self.output_link, self.depth
+        results = []
+        state = ROOT
+        for end, char in enumerate(string, 1):
+            column = index.get(char)
+            state = ROOT if column is None else table[state * width + column]
+            node = state if state in own else output_link[state]
+            while node != ROOT:
+                start = end - depth[node]
+                results.extend((start, end, rule_id) for rule_id in own[node])
+                node = output_link[node]
+        return results
@@ -0,0 +1,423 @@
+"""
+性能基准测试集合，用法：
+    python benchmark.py corpus [语料文件]
+    python benchmark.py incremental [规则数]
+    python benchmark.py prefilter [规则数]
+    python benchmark.py moore [最大状态数]
+    python benchmark.py shared [状态数] [工作进程数]
+    python benchmark.py parallel [规则数] [最大工作进程数]
+    python benchmark.py glushkov [正则表达式数]
+    python benchmark.py derivative [语料文件] [随机正则表达式数]
+    python benchmark.py literals [字面量数]
+    python benchmark.py reduction [语料文件] [随机正则表达式数] [规则数]
+    python benchmark.py acceleration [输入长度]
+每个基准测试对应一个bench_*函数，结果以表格形式打印
+"""
+import multiprocessing
+import pickle
+import random
+import string
+import sys
+import time
+
+from fuzz_regex import (DEFAULT_CORPUS, ENGINES, load_corpus, compile_engines,
+                        random_regex_tree, render_regex)
+from incremental_dfa import IncrementalDFA
+from nfa2dfa import DFA
+from DFA2minimal import hopcroft_minimization
+from pattern import compile_pattern, compile_rules
+
+
+def _timed(func, *args, repeat=1):
+    """执行func若干次，返回 (最后一次的结果, 最短耗时)"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def bench_corpus(path=DEFAULT_CORPUS, repeat=3):
+    """回放模糊测试保存的语料，测量各引擎的编译与匹配耗时"""
+    cases = load_corpus(path)
+    print(f"{'regex':<32} {'reason':<20} {'compile(ms)':>12} "
+          + ' '.join(f'{name + "(us/ch)":>14}' for name in ENGINES))
+    for case in cases:
+        (engines, timings, _), _ = _timed(compile_engines, case['regex'])
+        compile_ms = sum(timings.values()) * 1000
+        chars = max(sum(len(s) for s in case['inputs']), 1)
+        per_char = []
+        for name in ENGINES:
+            accepts = engines[name]
+            _, elapsed = _timed(lambda: [accepts(s) for s in case['inputs']], repeat=repeat)
+            per_char.append(elapsed / chars * 1e6)
+        regex = case['regex'] if len(case['regex']) <= 30 else case['regex'][:27] + '...'
+        print(f"{regex:<32} {case['reason']:<20} {compile_ms:>12.3f} "
+              + ' '.join(f'{value:>14.3f}' for value in per_char))
+
+
+def random_rules(count, seed=0):
+    """生成规则集合：随机字面量前缀后接一小段随机正则表达式"""
+    rng = random.Random(seed)
+    rules = []
+    for _ in range(count):
+        prefix = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 6)))
+        rules.append(prefix + render_regex(random_regex_tree(rng, 'abcdef', 2)))
+    return rules
+
+
+def bench_incremental(count=10000, batch=5, rounds=5):
+    """比较增量添加/删除少量规则与完整重建的耗时"""
+    count, batch = int(count), int(batch)
+    rules = random_rules(count + batch * rounds)
+    base, extra = rules[:count], rules[count:]
+
+    inc, build_time = _timed(IncrementalDFA, base)
+    _, rebuild_time = _timed(inc.rebuild)
+    print(f"规则数: {count}，DFA状态数: {len(inc.dfa.transitions)}")
+    print(f"{'操作':<16} {'耗时(ms)':>12}")
+    print(f"{'初始构建':<16} {build_time * 1000:>12.2f}")
+    print(f"{'完整重建':<16} {rebuild_time * 1000:>12.2f}")
+
+    add_times, remove_times = [], []
+    for i in range(rounds):
+        new_rules, elapsed = _timed(inc.update, extra[i * batch:(i + 1) * batch])
+        add_times.append(elapsed)
+        _, elapsed = _timed(lambda: inc.update(remove=new_rules))
+        remove_times.append(elapsed)
+    print(f"{f'增量添加{batch}条':<16} {sum(add_times) / rounds * 1000:>12.2f}")
+    print(f"{f'增量删除{batch}条':<16} {sum(remove_times) / rounds * 1000:>12.2f}")
+    _, minimize_time = _timed(inc.minimize)
+    print(f"{'按标签最小化':<16} {minimize_time * 1000:>12.2f}")
+
+
+def bench_prefilter(count=200, inputs=2000, length=40):
+    """比较启用与关闭必需字面量预过滤时的匹配吞吐量，并报告预过滤命中率"""
+    count, inputs, length = int(count), int(inputs), int(length)
+    rng = random.Random(1)
+    # 规则以任意串开头，DFA必须扫描整行才能判定，必需字面量在中间
+    literals = [''.join(rng.choice(string.ascii_lowercase) for _ in range(4)) for _ in range(count)]
+    rules = [f'(a|b|c|d|e|f)*{literal}(a|b)*' for literal in literals]
+    lines = [''.join(rng.choice('abcdef') for _ in range(length)) for _ in range(inputs)]
+    # 一部分输入包含某条规则的字面量，使预过滤无法全部直接拒绝
+    lines += [line + literal + 'ab' for literal, line in zip(rng.choices(literals, k=inputs), lines)]
+    chars = sum(len(line) for line in lines) * count
+
+    results = {}
+    for enabled in (False, True):
+        patterns = [compile_pattern(rule, prefilter=enabled) for rule in rules]
+        _, elapsed = _timed(lambda: [p.fullmatch(line) for p in patterns for line in lines])
+        results[enabled] = elapsed
+        runs = sum(p.automaton_runs for p in patterns)
+        print(f"预过滤{'开启' if enabled else '关闭'}: {elapsed * 1000:>10.2f} ms，"
+              f"{chars / elapsed / 1e6:>8.2f} M字符/秒，进入自动机 {runs} 次")
+    hit = [p.stats()['hit_rate'] for p in patterns if p.prefilter is not None]
+    print(f"使用预过滤的规则: {len(hit)}/{count}，平均命中率: {sum(hit) / max(len(hit), 1):.2%}，"
+          f"加速比: {results[False] / results[True]:.2f}x")
+
+
+def random_dfa(states, symbols, seed=0, accept_ratio=0.5):
+    """生成随机的完全DFA，状态为0..states-1"""
+    rng = random.Random(seed)
+    dfa = DFA(set(string.ascii_lowercase[:symbols]))
+    dfa.start_state = 0
+    dfa.transitions = {s: {c: rng.randrange(states) for c in sorted(dfa.alphabet)}
+                       for s in range(states)}
+    dfa.accept_states = {s for s in range(states) if rng.random() < accept_ratio}
+    return dfa
+
+
+def bench_moore(max_states=256000, symbols=4):
+    """比较Hopcroft与向量化Moore最小化在不同DFA规模下的耗时"""
+    from moore_minimization import moore_minimization, dense_table, compress_alphabet, refine_blocks
+    import numpy as np
+
+    max_states, symbols = int(max_states), int(symbols)
+    print(f"{'状态数':>10} {'hopcroft(ms)':>14} {'moore(ms)':>12} {'细化(ms)':>10} {'轮数':>6} {'一致':>6}")
+    n = 1000
+    while n <= max_states:
+        dfa = random_dfa(n, symbols, seed=n)
+        hopcroft_dfa, hopcroft_time = _timed(hopcroft_minimization(dfa).minimize)
+        moore = moore_minimization(dfa)
+        moore_dfa, moore_time = _timed(moore.minimize)
+        # 单独测量向量化细化本身（不含稠密表构建与结果DFA构建）
+        table, states, _ = dense_table(dfa)
+        initial = np.array([s in dfa.accept_states for s in states] + [False], dtype=np.int64)
+        _, refine_time = _timed(refine_blocks, compress_alphabet(table), initial)
+        same = hopcroft_dfa.transitions == moore_dfa.transitions
+        print(f"{n:>10} {hopcroft_time * 1000:>14.1f} {moore_time * 1000:>12.1f} "
+              f"{refine_time * 1000:>10.1f} {moore.rounds:>6} {str(same):>6}")
+        n *= 4
+
+
+def _memory_kb():
+    """返回本进程的比例驻留内存PSS（KB），共享页按挂载进程数均摊；无法读取时退回RSS"""
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Pss:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _pickle_worker(payload, barrier):
+    """工作进程：反序列化DFA对象"""
+    before = _memory_kb()
+    start = time.perf_counter()
+    dfa = pickle.loads(payload)
+    elapsed = time.perf_counter() - start
+    barrier.wait()  # 所有进程都完成加载后再测量，共享页才会按进程数均摊
+    return elapsed, _memory_kb() - before, len(dfa.transitions)
+
+
+def _shared_worker(name, barrier):
+    """工作进程：挂载共享DFA表，并读取整张表使所有页面驻留"""
+    from shared_dfa import SharedDFA
+
+    before = _memory_kb()
+    start = time.perf_counter()
+    shared = SharedDFA.attach(name)
+    elapsed = time.perf_counter() - start
+    shared.table.sum(dtype='int64')
+    barrier.wait()
+    used = _memory_kb() - before
+    rows = shared.table.shape[0]
+    shared.close()
+    return elapsed, used, rows
+
+
+def bench_shared(states=200000, workers=4, symbols=4):
+    """比较工作进程反序列化DFA对象与挂载共享内存DFA表的加载延迟和内存占用"""
+    from shared_dfa import SharedDFA
+
+    states, workers, symbols = int(states), int(workers), int(symbols)
+    dfa = random_dfa(states, symbols)
+    payload = pickle.dumps(dfa)
+    ctx = multiprocessing.get_context('spawn')
+    print(f"状态数: {states}，符号数: {symbols}，工作进程数: {workers}，pickle大小: {len(payload) / 1e6:.1f} MB")
+    print(f"{'方式':<10} {'加载延迟(ms)':>14} {'每进程PSS增量(MB)':>20}")
+
+    with ctx.Manager() as manager:
+        barrier = manager.Barrier(workers)
+        with ctx.Pool(workers) as pool:
+            results = pool.starmap(_pickle_worker, [(payload, barrier)] * workers)
+        latency = sum(r[0] for r in results) / workers
+        memory = sum(r[1] for r in results) / workers
+        print(f"{'pickle':<10} {latency * 1000:>14.2f} {memory / 1024:>20.2f}")
+
+        with SharedDFA.publish(dfa) as owner:
+            barrier = manager.Barrier(workers)
+            with ctx.Pool(workers) as pool:
+                results = pool.starmap(_shared_worker, [(owner.name, barrier)] * workers)
+        latency = sum(r[0] for r in results) / workers
+        memory = sum(r[1] for r in results) / workers
+        print(f"{'shared':<10} {latency * 1000:>14.2f} {memory / 1024:>20.2f}")
+
+
+def bench_parallel(count=10000, max_workers=16):
+    """并行子集构造在不同工作进程数下的耗时与加速比（规则并联NFA）"""
+    from nfa2dfa import subset_construction
+    from parallel_subset import parallel_subset_construction
+
+    count, max_workers = int(count), int(max_workers)
+    nfa = IncrementalDFA(random_rules(count)).nfa
+    _, serial_time = _timed(subset_construction, nfa)
+    print(f"规则数: {count}，NFA状态数: {len(nfa.transitions)}，CPU核数: {multiprocessing.cpu_count()}")
+    print(f"subset_construction: {serial_time * 1000:.1f} ms")
+    print(f"{'进程数':>6} {'耗时(ms)':>10} {'相对1进程':>10} {'相对串行':>10} {'DFA状态数':>10}")
+    baseline = None
+    workers = 1
+    while workers <= max_workers:
+        (dfa, _), elapsed = _timed(parallel_subset_construction, nfa, workers)
+        baseline = baseline or elapsed
+        print(f"{workers:>6} {elapsed * 1000:>10.1f} {baseline / elapsed:>10.2f} "
+              f"{serial_time / elapsed:>10.2f} {len(dfa.transitions):>10}")
+        workers *= 2
+
+
+def bench_glushkov(count=200, depth=7, inputs=20):
+    """比较Thompson与Glushkov构造的NFA状态数、子集构造耗时与匹配速度"""
+    from glushkov import postfix_to_glushkov, BitParallelNFA
+    from nfa2dfa import subset_construction
+    from fuzz_regex import sample_match
+    from re2nfa import regex_to_postfix, postfix_to_nfa
+
+    count, depth, inputs = int(count), int(depth), int(inputs)
+    rng = random.Random(3)
+    cases = []
+    for _ in range(count):
+        tree = random_regex_tree(rng, 'abcd', depth)
+        cases.append((regex_to_postfix(render_regex(tree)),
+                      [sample_match(rng, tree, max_repeat=6) for _ in range(inputs)]))
+    chars = sum(len(s) for _, strings in cases for s in strings)
+
+    print(f"正则表达式数: {count}，输入字符数: {chars}")
+    print(f"{'构造':<12} {'NFA状态':>8} {'构造(ms)':>10} {'子集构造(ms)':>14} {'NFA匹配(us/ch)':>16}")
+    builders = [('thompson', postfix_to_nfa), ('glushkov', postfix_to_glushkov)]
+    for name, build in builders:
+        nfas, build_time = _timed(lambda: [build(postfix) for postfix, _ in cases])
+        _, subset_time = _timed(lambda: [subset_construction(nfa) for nfa in nfas])
+        _, match_time = _timed(lambda: [nfa.accepts(s) for nfa, (_, strings) in zip(nfas, cases)
+                                        for s in strings])
+        states = sum(len(nfa.transitions) for nfa in nfas)
+        print(f"{name:<12} {states:>8} {build_time * 1000:>10.1f} {subset_time * 1000:>14.1f} "
+              f"{match_time / chars * 1e6:>16.3f}")
+        if name == 'glushkov':
+            simulators = [BitParallelNFA(nfa) for nfa in nfas]
+            _, match_time = _timed(lambda: [sim.accepts(s) for sim, (_, strings) in zip(simulators, cases)
+                                            for s in strings])
+            print(f"{'bit-parallel':<12} {'':>8} {'':>10} {'':>14} {match_time / chars * 1e6:>16.3f}")
+
+
+def bench_derivative(path=DEFAULT_CORPUS, count=200, depth=7):
+    """在语料与随机正则表达式上比较导数构造与子集构造路径的DFA规模与编译耗时"""
+    from derivative_dfa import DerivativeCompiler, LazyDerivativeMatcher
+    from nfa2dfa import subset_construction
+    from re2nfa import regex_to_postfix, postfix_to_nfa
+
+    count, depth = int(count), int(depth)
+    rng = random.Random(4)
+    suites = [('corpus', [case['regex'] for case in load_corpus(path)]),
+              ('random', [render_regex(random_regex_tree(rng, 'abcd', depth)) for _ in range(count)])]
+    print(f"{'语料':<8} {'路径':<10} {'DFA状态':>8} {'最小状态':>8} {'编译(ms)':>10} {'最小化(ms)':>12}")
+    for suite, regexes in suites:
+        def subset_path():
+            return [subset_construction(postfix_to_nfa(regex_to_postfix(regex))) for regex in regexes]
+
+        def derivative_path():
+            compiler = DerivativeCompiler()
+            return [compiler.to_dfa(compiler.from_regex(regex)) for regex in regexes]
+
+        for name, build in [('subset', subset_path), ('derivative', derivative_path)]:
+            dfas, build_time = _timed(build)
+            minimal, min_time = _timed(lambda: [hopcroft_minimization(dfa).minimize() for dfa in dfas])
+            states = sum(len(dfa.transitions) for dfa in dfas)
+            min_states = sum(len(dfa.transitions) for dfa in minimal)
+            print(f"{suite:<8} {name:<10} {states:>8} {min_states:>8} {build_time * 1000:>10.1f} "
+                  f"{min_time * 1000:>12.1f}")
+
+    cases = load_corpus(path)
+    chars = max(sum(len(s) for case in cases for s in case['inputs']), 1)
+    compiler = DerivativeCompiler()
+    matchers = [(LazyDerivativeMatcher(case['regex'], compiler), case['inputs']) for case in cases]
+    _, cold = _timed(lambda: [m.accepts(s) for m, strings in matchers for s in strings])
+    _, warm = _timed(lambda: [m.accepts(s) for m, strings in matchers for s in strings], repeat=3)
+    print(f"惰性导数匹配（语料）：首次 {cold / chars * 1e6:.3f} us/ch，缓存后 {warm / chars * 1e6:.3f} us/ch，"
+          f"导数表 {len(compiler.derivatives)} 项")
+
+
+def bench_literals(count=100000, inputs=20000, text_length=200000):
+    """比较纯字面量规则集合走Aho–Corasick与走通用路径（子集构造+最小化）的编译耗时与匹配速度"""
+    count, inputs, text_length = int(count), int(inputs), int(text_length)
+    rng = random.Random(5)
+    literals = [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+                for _ in range(count)]
+    strings = [rng.choice(literals) if i % 2 else
+               ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+               for i in range(inputs)]
+    chars = sum(len(s) for s in strings)
+
+    general, subset_time = _timed(IncrementalDFA, literals)
+    _, minimize_time = _timed(general.minimize)
+    rules, compile_time = _timed(compile_rules, literals)
+    automaton = rules.literals
+
+    expected, general_time = _timed(lambda: [general.match(s) for s in strings])
+    result, fast_time = _timed(lambda: [rules.match(s) for s in strings])
+    assert result == expected
+    print(f"字面量数: {count}，输入数: {inputs}（一半为命中）")
+    print(f"{'路径':<16} {'状态数':>10} {'编译(s)':>10} {'match(us/ch)':>14}")
+    print(f"{'subset':<16} {len(general.dfa.transitions):>10} {subset_time:>10.2f} "
+          f"{general_time / chars * 1e6:>14.3f}")
+    print(f"{'subset+minimize':<16} {'':>10} {subset_time + minimize_time:>10.2f}")
+    print(f"{'aho-corasick':<16} {automaton.states:>10} {compile_time:>10.2f} "
+          f"{fast_time / chars * 1e6:>14.3f}")
+
+    text = ''.join(rng.choice(string.ascii_lowercase) for _ in range(text_length))
+    found, scan_time = _timed(automaton.scan, text)
+    print(f"scan: {text_length} 字符，{len(found)} 处出现，{scan_time / text_length * 1e6:.3f} us/ch")
+
+
+def bench_reduction(path=DEFAULT_CORPUS, count=200, rules=2000, depth=7):
+    """NFA化简：在语料、随机正则表达式与规则集合上报告状态数化简比例与子集构造的加速"""
+    from nfa_reduction import reduce_nfa
+    from nfa2dfa import subset_construction
+    from re2nfa import regex_to_postfix, postfix_to_nfa
+
+    count, rules, depth = int(count), int(rules), int(depth)
+    rng = random.Random(6)
+    regexes = [render_regex(random_regex_tree(rng, 'abcd', depth)) for _ in range(count)]
+    suites = [('corpus', [postfix_to_nfa(regex_to_postfix(case['regex'])) for case in load_corpus(path)]),
+              ('random', [postfix_to_nfa(regex_to_postfix(regex)) for regex in regexes]),
+              (f'rules{rules}', [IncrementalDFA(random_rules(rules)).nfa])]
+    print(f"{'语料':<10} {'NFA状态':>8} {'化简后':>8} {'比例':>7} {'化简(ms)':>10} "
+          f"{'子集构造(ms)':>14} {'化简后子集构造(ms)':>20} {'确定化加速':>10} {'含化简':>8}")
+    for suite, nfas in suites:
+        reduced, reduce_time = _timed(lambda: [reduce_nfa(nfa) for nfa in nfas])
+        _, subset_time = _timed(lambda: [subset_construction(nfa) for nfa in nfas], repeat=3)
+        _, reduced_time = _timed(lambda: [subset_construction(nfa) for nfa in reduced], repeat=3)
+        before = sum(len(nfa.transitions) for nfa in nfas)
+        after = sum(len(nfa.transitions) for nfa in reduced)
+        print(f"{suite:<10} {before:>8} {after:>8} {after / before:>7.1%} {reduce_time * 1000:>10.1f} "
+              f"{subset_time * 1000:>14.1f} {reduced_time * 1000:>20.1f} "
+              f"{subset_time / reduced_time:>10.2f} {subset_time / (reduce_time + reduced_time):>8.2f}")
+    print("确定化加速 = 原子集构造耗时 / 化简后子集构造耗时；含化简 = 原子集构造耗时 / (化简 + 化简后子集构造)")
+
+
+def bench_acceleration(length=2000, inputs=200):
+    """比较最小化DFA逐字符匹配与状态加速匹配的速度，并报告跳过的输入比例"""
+    from acceleration import AcceleratedDFA
+
+    length, inputs = int(length), int(inputs)
+    rng = random.Random(7)
+    words = string.ascii_lowercase + '  /'
+
+    def text(prefix, suffix, chars=words):
+        return prefix + ''.join(rng.choice(chars) for _ in range(length)) + suffix
+
+    cases = [
+        ('GET /.* HTTP/1\\.[01]', lambda: text('GET /', ' HTTP/1.1')),
+        ('.*error.*', lambda: text('', 'error' if rng.random() < 0.5 else '')),
+        ('[a-z ]*;', lambda: text('', ';', string.ascii_lowercase + ' ')),
+        ('a.*b.*c', lambda: text('a', 'bc', 'adefxyz ')),
+    ]
+    print(f"输入数: {inputs}，每个输入约 {length} 字符")
+    print(f"{'regex':<24} {'加速状态':>8} {'DFA(us/ch)':>12} {'加速(us/ch)':>12} {'加速比':>8} {'跳过比例':>10}")
+    for regex, make in cases:
+        dfa = compile_pattern(regex, syntax='extended').dfa
+        matcher = AcceleratedDFA(dfa)
+        strings = [make() for _ in range(inputs)]
+        chars = sum(len(s) for s in strings)
+        expected, plain_time = _timed(lambda: [dfa.accepts(s) for s in strings])
+        result, fast_time = _timed(lambda: [matcher.accepts(s) for s in strings])
+        assert result == expected
+        print(f"{regex:<24} {len(matcher.accel):>8} {plain_time / chars * 1e6:>12.3f} "
+              f"{fast_time / chars * 1e6:>12.3f} {plain_time / fast_time:>8.2f} {matcher.skip_ratio:>10.1%}")
+
+
+BENCHMARKS = {
+    'corpus': bench_corpus,
+    'incremental': bench_incremental,
+    'prefilter': bench_prefilter,
+    'moore': bench_moore,
+    'shared': bench_shared,
+    'parallel': bench_parallel,
+    'glushkov': bench_glushkov,
+    'derivative': bench_derivative,
+    'literals': bench_literals,
+    'reduction': bench_reduction,
+    'acceleration': bench_acceleration,
+}
+
+
+if __name__ == "__main__":
+    name = sys.argv[1] if len(sys.argv) > 1 else 'corpus'
+    if name not in BENCHMARKS:
+        print(f"未知的基准测试: {name}，可选: {', '.join(BENCHMARKS)}")
+        sys.exit(1)
+    BENCHMARKS[name](*sys.argv[2:])
@@ -0,0 +1,275 @@
+"""
+Brzozowski导数构造：不经过NFA，直接由正则表达式的导数构建DFA
+1. 正则项做哈希合并（hash-consing）：每个不同的项只有一个整数编号，比较项即比较编号
+2. 构造项时规整化：选择与交按结合律、交换律、幂等律（ACI）合并为集合，
+   连接统一为右结合，并消去 ∅、ε 与嵌套闭包，等价的导数因此合并为同一个DFA状态
+3. 导数表 (项, 符号) -> 项 做记忆化，既用于构建完整DFA，也可作为惰性匹配引擎的缓存
+除了正则语法中的连接、选择、闭包，项还支持交（intersect），导数同样可以直接计算。
+扩展语法（regex_parser）的字符集合与计数重复直接作为项，计数重复不需要展开。
+"""
+from collections import deque
+
+from nfa2dfa import DFA
+from re2nfa import regex_to_postfix
+from regex_parser import Charset, Repeat
+
+EMPTY, EPSILON, SYMBOL, CAT, ALT, STAR, AND, SET, REPEAT = range(9)
+
+
+class DerivativeCompiler:
+    def __init__(self):
+        self.nodes = []       # 项编号 -> (种类, 参数)
+        self.ids = {}         # (种类, 参数) -> 项编号
+        self._nullable = []   # 项编号 -> 是否可空
+        self.derivatives = {}  # (项编号, 符号) -> 项编号
+        self.empty = self._intern(EMPTY, None, False)
+        self.epsilon = self._intern(EPSILON, None, True)
+
+    def _intern(self, kind, args, nullable):
+        key = (kind, args)
+        term = self.ids.get(key)
+        if term is None:
+            term = len(self.nodes)
+            self.nodes.append(key)
+            self._nullable.append(nullable)
+            self.ids[key] = term
+        return term
+
+    # ---- 项的构造（带规整化） ----
+
+    def symbol(self, char):
+        return self._intern(SYMBOL, char, False)
+
+    def charset(self, chars):
+        """匹配集合中任意一个字符"""
+        chars = frozenset(chars)
+        if not chars:
+            return self.empty
+        if len(chars) == 1:
+            return self.symbol(next(iter(chars)))
+        return self._intern(SET, chars, False)
+
+    def cat(self, left, right):
+        if left == self.empty or right == self.empty:
+            return self.empty
+        if left == self.epsilon:
+            return right
+        if right == self.epsilon:
+            return left
+        # (a·b)·c 统一为 a·(b·c)：取出左操作数的连接链，从右向左依次接上（不递归）
+        factors = []
+        while self.nodes[left][0] == CAT:
+            head, left = self.nodes[left][1]
+            factors.append(head)
+        factors.append(left)
+        for factor in reversed(factors):
+            right = self._intern(CAT, (factor, right), self._nullable[factor] and self._nullable[right])
+        return right
+
+    def cat_all(self, factors):
+        """依次连接factors中的项，从右向左构造，代价与项数成线性"""
+        result = self.epsilon
+        for factor in reversed(factors):
+            result = self.cat(factor, result)
+        return result
+
+    def _flatten(self, kind, terms):
+        flat = set()
+        for term in terms:
+            term_kind, args = self.nodes[term]
+            if term_kind == kind:
+                flat |= args
+            else:
+                flat.add(term)
+        return flat
+
+    def alt(self, *terms):
+        flat = self._flatten(ALT, terms)
+        flat.discard(self.empty)
+        if not flat:
+            return self.empty
+        if len(flat) == 1:
+            return next(iter(flat))
+        return self._intern(ALT, frozenset(flat), any(self._nullable[t] for t in flat))
+
+    def intersect(self, *terms):
+        flat = self._flatten(AND, terms)
+        if self.empty in flat:
+            return self.empty
+        if len(flat) == 1:
+            return next(iter(flat))
+        return self._intern(AND, frozenset(flat), all(self._nullable[t] for t in flat))
+
+    def star(self, term):
+        if term == self.empty or term == self.epsilon:
+            return self.epsilon
+        if self.nodes[term][0] == STAR:
+            return term
+        return self._intern(STAR, term, True)
+
+    def repeat(self, term, low, high):
+        """
+        计数重复 term{low,high}，high为None表示无上界；保持紧凑，不展开子项
+        term可空时 term{low,high} 与 term{0,high} 等价
+        """
+        if self._nullable[term]:
+            low = 0
+        if high == 0 or term == self.epsilon:
+            return self.epsilon
+        if term == self.empty:
+            return self.epsilon if low == 0 else self.empty
+        if (low, high) == (0, None):
+            return self.star(term)
+        if (low, high) == (1, 1):
+            return term
+        return self._intern(REPEAT, (term, low, high), low == 0)
+
+    def from_postfix(self, postfix):
+        """
+        由后缀表达式构造正则项
+        :param postfix: regex_to_postfix的结果，或regex_parser.parse_to_postfix的记号列表
+        """
+        # 栈中每一项是待连接的因子列表，连接只合并列表，遇到其他运算符时才构造项，
+        # 这样左结合的长连接链也只需线性时间（合并时把较短的列表并入较长的列表）
+        stack = []
+        for char in postfix:
+            if isinstance(char, Repeat):
+                stack.append([self.repeat(self.cat_all(stack.pop()), char.min, char.max)])
+            elif isinstance(char, Charset):
+                stack.append([self.charset(char)])
+            elif isinstance(char, int):
+                continue  # 捕获组不影响语言
+            elif char == '*':
+                stack.append([self.star(self.cat_all(stack.pop()))])
+            elif char == '.':
+                right = stack.pop()
+                left = stack.pop()
+                if len(left) >= len(right):
+                    left.extend(right)
+                else:
+                    right[:0] = left
+                    left = right
+                stack.append(left)
+            elif char == '|':
+                right = self.cat_all(stack.pop())
+                stack.append([self.alt(self.cat_all(stack.pop()), right)])
+            else:
+                stack.append([self.symbol(char)])
+        return self.cat_all(stack.pop()) if stack else self.epsilon
+
+    def from_regex(self, regex):
+        return self.from_postfix(regex_to_postfix(regex))
+
+    # ---- 导数 ----
+
+    def nullable(self, term):
+        return self._nullable[term]
+
+    def alphabet(self, term):
+        """项中出现的所有符号"""
+        symbols = set()
+        stack, seen = [term], set()
+        while stack:
+            current = stack.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            kind, args = self.nodes[current]
+            if kind == SYMBOL:
+                symbols.add(args)
+            elif kind == SET:
+                symbols |= args
+            elif kind in (CAT, ALT, AND):
+                stack.extend(args)
+            elif kind == STAR:
+                stack.append(args)
+            elif kind == REPEAT:
+                stack.append(args[0])
+        return symbols
+
+    def derivative(self, term, char):
+        """计算项关于符号char的导数（记忆化）"""
+        key = (term, char)
+        result = self.derivatives.get(key)
+        if result is not None:
+            return result
+
+        kind, args = self.nodes[term]
+        if kind == SYMBOL:
+            result = self.epsilon if args == char else self.empty
+        elif kind == SET:
+            result = self.epsilon if char in args else self.empty
+        elif kind == CAT:
+            left, right = args
+            result = self.cat(self.derivative(left, char), right)
+            if self._nullable[left]:
+                result = self.alt(result, self.derivative(right, char))
+        elif kind == ALT:
+            result = self.alt(*(self.derivative(t, char) for t in args))
+        elif kind == AND:
+            result = self.intersect(*(self.derivative(t, char) for t in args))
+        elif kind == STAR:
+            result = self.cat(self.derivative(args, char), term)
+        elif kind == REPEAT:
+            # 子项不可空（可空时已规整为下界0）：d(r{m,n}) = d(r)·r{m-1,n-1}
+            inner, low, high = args
+            rest = self.repeat(inner, max(low - 1, 0), None if high is None else high - 1)
+            result = self.cat(self.derivative(inner, char), rest)
+        else:
+            result = self.empty
+        self.derivatives[key] = result
+        return result
+
+    def to_dfa(self, term, alphabet=None, max_states=None):
+        """
+        从项出发按导数做BFS构建DFA，状态按BFS顺序编号，∅ 对应的死状态省略
+        :param alphabet: 字母表，默认取项中出现的符号
+        :param max_states: 可选的状态数上限，超过时抛出ValueError
+        """
+        symbols = sorted(alphabet if alphabet is not None else self.alphabet(term))
+        dfa = DFA(set(symbols))
+        dfa.start_state = 0
+        numbering = {term: 0}
+        queue = deque([term])
+        while queue:
+            current = queue.popleft()
+            state = numbering[current]
+            dfa.transitions[state] = {}
+            if self._nullable[current]:
+                dfa.accept_states.add(state)
+            for char in symbols:
+                target = self.derivative(current, char)
+                if target == self.empty:
+                    continue
+                if target not in numbering:
+                    if max_states is not None and len(numbering) >= max_states:
+                        raise ValueError(f"导数DFA状态数超过上限 {max_states}")
+                    numbering[target] = len(numbering)
+                    queue.append(target)
+                dfa.transitions[state][char] = numbering[target]
+        return dfa
+
+
+class LazyDerivativeMatcher:
+    def __init__(self, regex, compiler=None):
+        """
+        惰性匹配引擎：匹配时按需计算导数，导数表即DFA转换的缓存
+        :param compiler: 可共享的DerivativeCompiler，多个模式共用时可复用相同子项的导数
+        """
+        self.compiler = compiler or DerivativeCompiler()
+        self.term = self.compiler.from_regex(regex)
+
+    def accepts(self, string):
+        compiler = self.compiler
+        term = self.term
+        for char in string:
+            term = compiler.derivative(term, char)
+            if term == compiler.empty:
+                return False
+        return compiler.nullable(term)
+
+
+def derivative_dfa(regex):
+    """由正则表达式直接构建导数DFA"""
+    compiler = DerivativeCompiler()
+    return compiler.to_dfa(compiler.from_regex(regex))
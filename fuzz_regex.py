@@ -0,0 +1,256 @@
+"""
+正则表达式差分模糊测试：
+1. 在支持的语法（字母数字、连接、|、*、括号）内随机生成正则表达式
+2. 为每个正则表达式生成随机输入串以及一定比例保证匹配的输入串
+3. 对照检查Thompson NFA、子集构造DFA、最小化DFA与Python re.fullmatch的结果
+4. 记录每个用例的编译时间与匹配时间，把结果不一致与性能最差的用例保存为语料，供benchmark.py回放
+"""
+import json
+import random
+import re
+import time
+
+from re2nfa import regex_to_postfix, postfix_to_nfa
+from nfa2dfa import subset_construction
+from DFA2minimal import hopcroft_minimization
+
+DEFAULT_CORPUS = 'fuzz_corpus.json'
+CORPUS_VERSION = 1
+ENGINES = ('nfa', 'dfa', 'min_dfa')
+
+
+def random_regex_tree(rng, alphabet='ab', max_depth=4):
+    """
+    随机生成正则表达式语法树，节点格式：
+        ('lit', c) | ('cat', left, right) | ('alt', left, right) | ('star', child)
+    """
+    if max_depth == 0 or rng.random() < 0.3:
+        return ('lit', rng.choice(alphabet))
+    kind = rng.choice(('cat', 'cat', 'alt', 'star'))
+    if kind == 'star':
+        return ('star', random_regex_tree(rng, alphabet, max_depth - 1))
+    return (kind,
+            random_regex_tree(rng, alphabet, max_depth - 1),
+            random_regex_tree(rng, alphabet, max_depth - 1))
+
+
+def render_regex(tree, rng=None, explicit_dot=0.0):
+    """
+    将语法树渲染为正则表达式字符串
+    :param rng: 随机数生成器，仅在explicit_dot>0时使用
+    :param explicit_dot: 连接处写出显式'.'运算符的概率（Python re中'.'含义不同，渲染re版本时应为0）
+    """
+    kind = tree[0]
+    if kind == 'lit':
+        return tree[1]
+    if kind == 'star':
+        inner = render_regex(tree[1], rng, explicit_dot)
+        if tree[1][0] != 'lit':
+            inner = f'({inner})'
+        return inner + '*'
+    left = render_regex(tree[1], rng, explicit_dot)
+    right = render_regex(tree[2], rng, explicit_dot)
+    if kind == 'alt':
+        return f'({left}|{right})'
+    sep = '.' if explicit_dot and rng.random() < explicit_dot else ''
+    return left + sep + right
+
+
+def sample_match(rng, tree, max_repeat=3):
+    """沿语法树随机游走，生成一个必然被该正则表达式接受的字符串"""
+    kind = tree[0]
+    if kind == 'lit':
+        return tree[1]
+    if kind == 'cat':
+        return sample_match(rng, tree[1], max_repeat) + sample_match(rng, tree[2], max_repeat)
+    if kind == 'alt':
+        return sample_match(rng, rng.choice(tree[1:]), max_repeat)
+    return ''.join(sample_match(rng, tree[1], max_repeat)
+                   for _ in range(rng.randint(0, max_repeat)))
+
+
+def random_string(rng, alphabet, max_length=10):
+    """在给定字母表上生成随机字符串"""
+    return ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, max_length)))
+
+
+def compile_engines(regex):
+    """
+    编译正则表达式，返回 (引擎字典, 编译耗时字典, 状态数字典)
+    引擎字典的值都是 string -> bool 的判定函数
+    """
+    timings = {}
+    start = time.perf_counter()
+    postfix = regex_to_postfix(regex)
+    nfa = postfix_to_nfa(postfix)
+    timings['nfa'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    dfa = subset_construction(nfa)
+    timings['dfa'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    min_dfa = hopcroft_minimization(dfa).minimize()
+    timings['min_dfa'] = time.perf_counter() - start
+
+    engines = {'nfa': nfa.accepts, 'dfa': dfa.accepts, 'min_dfa': min_dfa.accepts}
+    sizes = {'nfa': len(nfa.transitions), 'dfa': len(dfa.transitions),
+             'min_dfa': len(min_dfa.transitions)}
+    return engines, timings, sizes
+
+
+def check_case(regex, python_regex, inputs, engines=None, oracle=None):
+    """
+    对一个正则表达式运行差分检查
+    :param regex: 本项目语法的正则表达式（可含显式'.'连接符）
+    :param python_regex: 等价的Python re语法
+    :param inputs: 待检查的输入串列表
+    :param engines: 可选，预先编译好的引擎字典；默认调用compile_engines编译
+    :param oracle: 可选，string -> 期望结果；默认为re.fullmatch(python_regex, string)是否成功
+    :return: 用例结果字典，包含divergences、compile_time、match_time与sizes
+    """
+    timings, sizes = {}, {}
+    if engines is None:
+        engines, timings, sizes = compile_engines(regex)
+    if oracle is None:
+        reference = re.compile(python_regex)
+        oracle = lambda string: reference.fullmatch(string) is not None
+
+    match_time = {name: 0.0 for name in engines}
+    divergences = []
+    for string in inputs:
+        expected = oracle(string)
+        results = {}
+        for name, accepts in engines.items():
+            start = time.perf_counter()
+            results[name] = accepts(string)
+            match_time[name] += time.perf_counter() - start
+        if any(result != expected for result in results.values()):
+            divergences.append({'input': string, 'expected': expected, 'results': results})
+
+    return {
+        'regex': regex,
+        'python_regex': python_regex,
+        'inputs': list(inputs),
+        'divergences': divergences,
+        'compile_time': timings,
+        'match_time': match_time,
+        'input_chars': sum(len(s) for s in inputs),
+        'sizes': sizes,
+    }
+
+
+def random_cases(seed, count, alphabet='ab', max_depth=4, explicit_dot=0.0, inputs_per_case=20,
+                 max_length=10, max_repeat=3, noise='z'):
+    """
+    生成差分检查用例
+    :param explicit_dot: 本项目语法的版本在连接处写出显式'.'的概率
+    :param noise: 随机输入额外使用的字符，用于测试字母表之外的符号
+    :return: 生成器，每项为 (语法树, 本项目语法的正则表达式, 等价的Python re语法, 输入列表)，
+             输入一半为随机串，一半为保证匹配的串
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        tree = random_regex_tree(rng, alphabet, max_depth)
+        regex = render_regex(tree, rng, explicit_dot)
+        python_regex = render_regex(tree)
+        inputs = [random_string(rng, alphabet + noise, max_length)
+                  for _ in range(inputs_per_case // 2)]
+        inputs += [sample_match(rng, tree, max_repeat) for _ in range(inputs_per_case - len(inputs))]
+        yield tree, regex, python_regex, inputs
+
+
+def fuzz(iterations=200, seed=0, alphabet='ab', max_depth=4, inputs_per_case=20,
+         max_length=10, explicit_dot=0.2):
+    """
+    运行差分模糊测试
+    :return: 所有用例结果的列表（见check_case）
+    """
+    return [check_case(regex, python_regex, inputs)
+            for _, regex, python_regex, inputs in random_cases(
+                seed, iterations, alphabet, max_depth, explicit_dot, inputs_per_case, max_length)]
+
+
+def _scaling_metrics(case):
+    """计算用例的扩展性指标：总编译耗时、子集构造得到的DFA状态数、NFA每字符匹配耗时"""
+    chars = max(case['input_chars'], 1)
+    return {
+        'compile_time': sum(case['compile_time'].values()),
+        'dfa_states': case['sizes'].get('dfa', 0),
+        'nfa_match_per_char': case['match_time'].get('nfa', 0.0) / chars,
+    }
+
+
+def select_corpus(cases, top_k=5):
+    """
+    从用例中挑选需要保存的语料：
+    - 所有结果不一致的用例
+    - 各扩展性指标下最差的top_k个用例
+    """
+    corpus = []
+    seen = set()
+
+    def add(case, reason):
+        key = (case['regex'], reason)
+        if key in seen:
+            return
+        seen.add(key)
+        corpus.append({
+            'regex': case['regex'],
+            'python_regex': case['python_regex'],
+            'inputs': case['inputs'],
+            'reason': reason,
+            'metrics': _scaling_metrics(case),
+            'sizes': case['sizes'],
+            'divergences': case['divergences'],
+        })
+
+    for case in cases:
+        if case['divergences']:
+            add(case, 'divergence')
+
+    metrics = [(case, _scaling_metrics(case)) for case in cases]
+    for reason in ('compile_time', 'dfa_states', 'nfa_match_per_char'):
+        ranked = sorted(metrics, key=lambda item: item[1][reason], reverse=True)
+        for case, _ in ranked[:top_k]:
+            add(case, reason)
+    return corpus
+
+
+def save_corpus(corpus, path=DEFAULT_CORPUS):
+    """将语料保存为JSON文件"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'version': CORPUS_VERSION, 'cases': corpus}, f, ensure_ascii=False, indent=2)
+
+
+def load_corpus(path=DEFAULT_CORPUS):
+    """读取JSON语料文件，返回用例列表"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('version') != CORPUS_VERSION:
+        raise ValueError(f"不支持的语料版本: {data.get('version')}")
+    return data['cases']
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='正则表达式差分模糊测试')
+    parser.add_argument('-n', '--iterations', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--depth', type=int, default=5)
+    parser.add_argument('--top', type=int, default=5)
+    parser.add_argument('-o', '--output', default=DEFAULT_CORPUS)
+    args = parser.parse_args()
+
+    cases = fuzz(args.iterations, args.seed, max_depth=args.depth)
+    corpus = select_corpus(cases, args.top)
+    save_corpus(corpus, args.output)
+
+    failed = [case for case in cases if case['divergences']]
+    print(f"用例总数: {len(cases)}，结果不一致: {len(failed)}")
+    for case in failed:
+        first = case['divergences'][0]
+        print(f"  {case['regex']!r} 输入 {first['input']!r}: "
+              f"期望 {first['expected']}，实际 {first['results']}")
+    print(f"已保存 {len(corpus)} 条语料到 {args.output}")
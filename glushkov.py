@@ -0,0 +1,132 @@
+"""
+Glushkov（位置自动机）构造，作为Thompson构造的替代：
+1. 后缀表达式中的每个字面量是一个位置（按出现顺序编号1..n），状态0为初始状态
+2. 自底向上计算每个子表达式的nullable、first、last集合以及各位置的follow集合
+3. 状态q经符号sym(p)转换到p，当且仅当p∈first(整体)（q为0时）或p∈follow(q)
+得到的NFA恰好有n+1个状态且没有ε转换；进入同一状态的转换符号都相同，
+因此可以用位并行的方式模拟（BitParallelNFA）。
+扩展语法的Charset记号对应一个可接受多个符号的位置；x?、x+ 直接修改nullable与follow，
+计数重复由expand_counted展开，只为必需的副本分配位置。
+"""
+from re2nfa import NFA
+from regex_parser import Charset, Repeat, OPTIONAL, expand_counted
+
+INITIAL = 0
+
+
+def postfix_to_glushkov(postfix):
+    """由后缀表达式构建Glushkov NFA"""
+    symbols = [frozenset()]  # 位置 -> 可接受的符号集合，位置0为初始状态
+    follow = [set()]         # 位置 -> follow集合
+    stack = []               # (nullable, first, last)
+
+    for char in expand_counted(postfix):
+        if isinstance(char, Repeat):
+            nullable, first, last = stack.pop()
+            if char == OPTIONAL:
+                stack.append((True, first, last))
+            else:
+                for position in last:
+                    follow[position] |= first
+                stack.append((nullable, first, last))
+        elif isinstance(char, int):
+            continue  # 捕获组不影响位置自动机
+        elif char == '*':
+            nullable, first, last = stack.pop()
+            for position in last:
+                follow[position] |= first
+            stack.append((True, first, last))
+        elif char == '.':
+            right = stack.pop()
+            left = stack.pop()
+            for position in left[2]:
+                follow[position] |= right[1]
+            first = left[1] | right[1] if left[0] else left[1]
+            last = left[2] | right[2] if right[0] else right[2]
+            stack.append((left[0] and right[0], first, last))
+        elif char == '|':
+            right = stack.pop()
+            left = stack.pop()
+            stack.append((left[0] or right[0], left[1] | right[1], left[2] | right[2]))
+        else:
+            position = len(symbols)
+            symbols.append(char if isinstance(char, Charset) else frozenset(char))
+            follow.append(set())
+            stack.append((False, frozenset({position}), frozenset({position})))
+
+    nullable, first, last = stack.pop()
+    transitions = {state: {} for state in range(len(symbols))}
+    for state in range(len(symbols)):
+        targets = first if state == INITIAL else follow[state]
+        for target in targets:
+            for symbol in symbols[target]:
+                transitions[state].setdefault(symbol, set()).add(target)
+
+    accept_states = set(last) | ({INITIAL} if nullable else set())
+    return NFA(INITIAL, set().union(*symbols), transitions, accept_states, epsilon_free=True)
+
+
+class BitParallelNFA:
+    def __init__(self, nfa):
+        """
+        位并行模拟无ε转换、且进入同一状态的转换符号（集合）都相同的NFA（如Glushkov NFA）
+        状态集合用整数位掩码表示，每一步：D = follow(D) & B[c]
+        follow(D)按8位一组查表求并，表共 ceil(状态数/8) × 256 项
+        """
+        states = sorted(nfa.transitions)
+        self.bit = {state: 1 << i for i, state in enumerate(states)}
+        self.start_mask = self.bit[nfa.start_state]
+        self.accept_mask = 0
+        for state in nfa.accept_states:
+            self.accept_mask |= self.bit[state]
+
+        # B[c]：经符号c进入的状态集合；follow_masks[i]：状态i的所有后继
+        self.symbol_masks = {}
+        entry_symbols = {}
+        follow_masks = []
+        for state in states:
+            incoming = {}   # 目标状态 -> 从本状态进入它的符号集合
+            for symbol, targets in nfa.transitions[state].items():
+                if symbol is None or symbol == 'ε':
+                    raise ValueError("位并行模拟要求NFA没有ε转换")
+                for target in targets:
+                    incoming.setdefault(target, set()).add(symbol)
+            mask = 0
+            for target, symbols in incoming.items():
+                if entry_symbols.setdefault(target, symbols) != symbols:
+                    raise ValueError(f"状态{target}的入边符号不唯一，无法位并行模拟")
+                mask |= self.bit[target]
+                for symbol in symbols:
+                    self.symbol_masks[symbol] = self.symbol_masks.get(symbol, 0) | self.bit[target]
+            follow_masks.append(mask)
+
+        self.tables = []
+        for chunk in range(0, len(states), 8):
+            masks = follow_masks[chunk:chunk + 8]
+            table = [0] * 256
+            for byte in range(1, 256):
+                # 去掉最低位后的结果已算出，再并上最低位对应状态的后继
+                low = byte & -byte
+                index = low.bit_length() - 1
+                table[byte] = table[byte ^ low] | (masks[index] if index < len(masks) else 0)
+            self.tables.append(table)
+
+    def _follow(self, mask):
+        result = 0
+        for table in self.tables:
+            if mask & 255:
+                result |= table[mask & 255]
+            mask >>= 8
+            if not mask:
+                break
+        return result
+
+    def accepts(self, string):
+        """判断NFA是否接受给定字符串"""
+        current = self.start_mask
+        symbol_masks = self.symbol_masks
+        for char in string:
+            current = self._follow(current) & symbol_masks.get(char, 0)
+            if not current:
+                return False
+        return bool(current & self.accept_mask)
@@ -0,0 +1,229 @@
+"""
+规则集合的增量DFA：
+1. 所有规则的Thompson NFA通过公共起始状态的ε转换并联成一个NFA，每个接受状态标记所属规则
+2. DFA状态即NFA状态子集（与subset_construction相同），保留子集到转换的映射
+3. 添加规则时，只有包含新规则状态的子集需要重新确定化，其余子集的转换保持不变
+4. 删除规则时，把子集投影掉该规则的状态即可得到新的DFA，无需再计算move和ε-闭包
+"""
+from collections import deque
+
+from re2nfa import NFA, regex_to_postfix, postfix_to_nfa
+from nfa2dfa import DFA, epsilon_closure
+from DFA2minimal import hopcroft_minimization
+from parallel_subset import successors
+
+UNION_START = 0
+
+
+class IncrementalDFA:
+    def __init__(self, patterns=(), to_postfix=regex_to_postfix):
+        """
+        :param patterns: 初始规则（正则表达式）列表，规则号按顺序从0开始分配
+        :param to_postfix: 正则表达式 -> 后缀表达式，扩展语法可传入regex_parser.parse_to_postfix
+        """
+        self.to_postfix = to_postfix
+        self.nfa = NFA(UNION_START, set(), {UNION_START: {None: set()}}, set())
+        self.dfa = DFA(set())
+        self.rule_states = {}    # 规则号 -> 该规则的NFA状态集合
+        self.rule_alphabet = {}  # 规则号 -> 该规则用到的符号
+        self.accept_tags = {}    # NFA接受状态 -> 规则号
+        self.tags = {}           # DFA接受状态 -> 命中的规则号集合
+        self._next_state = UNION_START + 1
+        self._next_rule = 0
+        self._live_states = 0    # 上次垃圾回收后的DFA状态数
+
+        for pattern in patterns:
+            self._attach_rule(self._build_rule(pattern))
+        self.rebuild()
+
+    def _build_rule(self, pattern):
+        """构建规则的Thompson NFA（语法错误在此抛出，不改变规则集合）"""
+        return postfix_to_nfa(self.to_postfix(pattern))
+
+    def _attach_rule(self, rule_nfa):
+        """把规则的NFA重新编号后并入并联NFA，返回规则号"""
+        offset = self._next_state
+        states = set()
+        for state, trans in rule_nfa.transitions.items():
+            states.add(state + offset)
+            self.nfa.transitions[state + offset] = {
+                symbol: {target + offset for target in targets}
+                for symbol, targets in trans.items()
+            }
+        self._next_state = max(states) + 1
+
+        rule_id = self._next_rule
+        self._next_rule += 1
+        self.rule_states[rule_id] = states
+        self.rule_alphabet[rule_id] = set(rule_nfa.alphabet)
+        self.nfa.transitions[UNION_START][None].add(rule_nfa.start_state + offset)
+        for accept in rule_nfa.accept_states:
+            self.accept_tags[accept + offset] = rule_id
+            self.nfa.accept_states.add(accept + offset)
+        self.nfa.alphabet |= rule_nfa.alphabet
+        self.dfa.alphabet |= rule_nfa.alphabet
+        return rule_id
+
+    def _detach_rule(self, rule_id):
+        """从并联NFA中移除规则，返回被移除的NFA状态集合"""
+        states = self.rule_states.pop(rule_id)
+        del self.rule_alphabet[rule_id]
+        self.nfa.transitions[UNION_START][None] -= states
+        for state in states:
+            del self.nfa.transitions[state]
+            if self.accept_tags.pop(state, None) is not None:
+                self.nfa.accept_states.discard(state)
+        alphabet = set().union(*self.rule_alphabet.values())
+        self.nfa.alphabet = alphabet
+        self.dfa.alphabet = set(alphabet)
+        return states
+
+    def _tag(self, subset):
+        """根据子集包含的NFA接受状态设置DFA状态的规则标签"""
+        rules = frozenset(self.accept_tags[s] for s in subset if s in self.accept_tags)
+        if rules:
+            self.tags[subset] = rules
+            self.dfa.accept_states.add(subset)
+
+    def _untag(self, subset):
+        self.tags.pop(subset, None)
+        self.dfa.accept_states.discard(subset)
+
+    def _determinize_from(self, start):
+        """从start出发做子集构造，遇到已存在的子集即停止，返回新确定化的子集数"""
+        transitions = self.dfa.transitions
+        if start in transitions:
+            return 0
+        queue = deque([start])
+        pending = {start}
+        while queue:
+            subset = queue.popleft()
+            trans = successors(self.nfa, subset)
+            transitions[subset] = trans
+            self._tag(subset)
+            for target in trans.values():
+                if target not in transitions and target not in pending:
+                    pending.add(target)
+                    queue.append(target)
+        return len(pending)
+
+    def _project(self, removed):
+        """
+        把DFA中所有包含removed状态的子集投影为 subset - removed：
+        各规则的NFA互不相连，投影后的转换就是原转换目标的投影，
+        不含removed状态的子集及其后继都不受影响
+        """
+        transitions = self.dfa.transitions
+        start = self.dfa.start_state
+        queue = deque([start])
+        visited = {start}
+        projected = {}
+        while queue:
+            subset = queue.popleft()
+            new_trans = {}
+            for symbol, target in transitions[subset].items():
+                if target & removed:
+                    if target not in visited:
+                        visited.add(target)
+                        queue.append(target)
+                    target = target - removed
+                    if not target:
+                        continue
+                new_trans[symbol] = target
+            new_subset = subset - removed
+            if new_subset:
+                projected[new_subset] = new_trans
+
+        for subset in visited:
+            del transitions[subset]
+            self._untag(subset)
+        for subset, trans in projected.items():
+            if subset not in transitions:
+                transitions[subset] = trans
+                self._tag(subset)
+        self.dfa.start_state = start - removed
+
+    def collect_garbage(self):
+        """删除从起始状态不可达的DFA状态"""
+        transitions = self.dfa.transitions
+        reachable = {self.dfa.start_state}
+        queue = deque([self.dfa.start_state])
+        while queue:
+            for target in transitions[queue.popleft()].values():
+                if target not in reachable:
+                    reachable.add(target)
+                    queue.append(target)
+        for subset in [s for s in transitions if s not in reachable]:
+            del transitions[subset]
+            self._untag(subset)
+        self._live_states = len(transitions)
+
+    def rebuild(self):
+        """丢弃现有DFA，从头对并联NFA做子集构造"""
+        self.dfa.transitions = {}
+        self.dfa.accept_states = set()
+        self.tags = {}
+        self.dfa.start_state = frozenset(epsilon_closure(self.nfa, {UNION_START}))
+        self._determinize_from(self.dfa.start_state)
+        self._live_states = len(self.dfa.transitions)
+
+    def update(self, add=(), remove=()):
+        """
+        增量更新规则集合
+        :param add: 新增规则（正则表达式）列表
+        :param remove: 待删除的规则号列表
+        :return: 新增规则的规则号列表
+        :raises KeyError: remove中有不存在的规则号，此时规则集合保持不变
+        """
+        # 先检查全部参数，出错时不修改任何状态
+        remove = list(remove)
+        unknown = [rule_id for rule_id in remove if rule_id not in self.rule_states]
+        if unknown:
+            raise KeyError(unknown[0])
+        rule_nfas = [self._build_rule(pattern) for pattern in add]
+
+        removed = set()
+        for rule_id in set(remove):
+            removed |= self._detach_rule(rule_id)
+        if removed:
+            self._project(removed)
+
+        new_rules = [self._attach_rule(rule_nfa) for rule_nfa in rule_nfas]
+        if new_rules:
+            # 新规则只改变起始子集以及包含新规则状态的子集
+            start = frozenset(epsilon_closure(self.nfa, {UNION_START}))
+            self.dfa.start_state = start
+            self._determinize_from(start)
+
+        # 旧的起始子集等状态可能已不可达，DFA膨胀一倍时再统一回收
+        if len(self.dfa.transitions) > 2 * max(self._live_states, 1):
+            self.collect_garbage()
+        return new_rules
+
+    def add(self, pattern):
+        """添加一条规则，返回规则号"""
+        return self.update(add=[pattern])[0]
+
+    def remove(self, rule_id):
+        """删除一条规则"""
+        self.update(remove=[rule_id])
+
+    def match(self, string):
+        """返回完整匹配string的规则号集合"""
+        state = self.dfa.start_state
+        for char in string:
+            state = self.dfa.transitions[state].get(char)
+            if state is None:
+                return set()
+        return set(self.tags.get(state, ()))
+
+    def minimize(self):
+        """
+        按规则标签最小化当前DFA
+        :return: (最小化DFA, {最小化DFA接受状态: 规则号集合})
+        """
+        hopcroft = hopcroft_minimization(self.dfa, labels=self.tags)
+        min_dfa = hopcroft.minimize()
+        min_tags = {hopcroft.state_map[state]: rules for state, rules in self.tags.items()
+                    if state in hopcroft.state_map}
+        return min_dfa, min_tags
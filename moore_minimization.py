@@ -0,0 +1,95 @@
+"""
+基于NumPy的向量化Moore分区细化，作为hopcroft_minimization的替代：
+1. 把DFA转换为稠密转换表 delta[状态, 符号类]，缺失的转换指向额外的死状态
+2. 合并所有状态上转换完全相同的符号（字母表压缩）
+3. 每一轮构造签名矩阵 [block[s], block[delta[s, c]] for c]，
+   用 np.unique(..., axis=0, return_inverse=True) 重新编号，直到分区数不再变化
+每轮都是整表的向量运算，轮数最坏为状态数，但对随机或宽而浅的大DFA通常只需很少几轮。
+输出与hopcroft_minimization(dfa).minimize()完全相同。
+"""
+import numpy as np
+
+from DFA2minimal import DEAD_STATE, quotient_dfa, reachable_states
+
+
+def dense_table(dfa, states=None):
+    """
+    将DFA转换为稠密转换表
+    :param states: 状态列表，默认取所有可达状态，起始状态排在第0位
+    :return: (转换表, 状态列表, 符号列表)；转换表形状为 (状态数+1, 符号数)，最后一行是死状态
+    """
+    if states is None:
+        states = [dfa.start_state] + [s for s in reachable_states(dfa) if s != dfa.start_state]
+    symbols = sorted(dfa.alphabet)
+    index = {state: i for i, state in enumerate(states)}
+    dead = len(states)
+    table = np.full((len(states) + 1, len(symbols)), dead, dtype=np.int64)
+    for state, i in index.items():
+        trans = dfa.transitions.get(state, {})
+        for j, symbol in enumerate(symbols):
+            target = trans.get(symbol)
+            if target is not None:
+                table[i, j] = index[target]
+    return table, states, symbols
+
+
+def compress_alphabet(table):
+    """合并在所有状态上转换都相同的符号列，返回压缩后的转换表"""
+    if table.shape[1] <= 1:
+        return table
+    return np.unique(table, axis=1)
+
+
+def refine_blocks(table, initial):
+    """
+    Moore分区细化
+    :param table: 稠密转换表，形状为 (状态数, 符号数)
+    :param initial: 初始分区号数组（如接受/非接受）
+    :return: (最终分区号数组, 细化轮数)
+    """
+    _, block = np.unique(initial, return_inverse=True)
+    block = block.ravel()
+    count = block.max() + 1 if block.size else 0
+    rounds = 0
+    while True:
+        rounds += 1
+        signature = np.column_stack([block, block[table]])
+        _, new_block = np.unique(signature, axis=0, return_inverse=True)
+        new_block = new_block.ravel()
+        new_count = new_block.max() + 1
+        block = new_block
+        # Moore细化只会让分区变细，分区数不变即达到不动点
+        if new_count == count:
+            return block, rounds
+        count = new_count
+
+
+class moore_minimization:
+    def __init__(self, dfa, labels=None):
+        """
+        :param dfa: 待最小化的DFA
+        :param labels: 可选，{接受状态: 标签}，含义与hopcroft_minimization相同
+        """
+        self.dfa = dfa
+        self.labels = labels
+        self.rounds = 0
+        self.state_map = {}  # 原DFA状态 -> 最小化DFA状态
+
+    def minimize(self):
+        """执行向量化Moore算法进行DFA最小化"""
+        table, states, _ = dense_table(self.dfa)
+        table = compress_alphabet(table)
+
+        # 初始分区：非接受状态与死状态为0，接受状态按标签分配正整数
+        label_ids = {}
+        initial = np.zeros(len(states) + 1, dtype=np.int64)
+        for i, state in enumerate(states):
+            if state in self.dfa.accept_states:
+                label = self.labels.get(state) if self.labels is not None else True
+                initial[i] = label_ids.setdefault(label, len(label_ids) + 1)
+
+        block, self.rounds = refine_blocks(table, initial)
+        block_of = dict(zip(states, block.tolist()))
+        block_of[DEAD_STATE] = int(block[len(states)])
+        min_dfa, self.state_map = quotient_dfa(self.dfa, block_of)
+        return min_dfa
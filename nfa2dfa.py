@@ -1,6 +1,9 @@
 from collections import deque
 from graphviz import Digraph
 
+# ε转换可能使用的两种符号
+EPSILON_SYMBOLS = (None, 'ε')
+
 class NFA:
     def __init__(self, start_state, alphabet, transitions, accept_states):
         """
@@ -16,6 +19,7 @@ class NFA:
         self.alphabet = alphabet
         self.transitions = transitions
         self.accept_states = accept_states
+        self.epsilon_free = False  # 为True时子集构造跳过ε-闭包
         
     def visualize(self, filename='nfa'):
         """将NFA可视化为图形"""
@@ -56,6 +60,15 @@ class DFA:
         self.transitions = {}    # {state: {symbol: next_state}}
         self.accept_states = set()
         
+    def accepts(self, string):
+        """判断DFA是否接受给定字符串，缺失的转换视为进入死状态"""
+        state = self.start_state
+        for char in string:
+            state = self.transitions.get(state, {}).get(char)
+            if state is None:
+                return False
+        return state in self.accept_states
+        
     def visualize(self, filename='dfa'):
         """将DFA可视化为图形"""
         dot = Digraph(comment='DFA Visualization')
@@ -96,8 +109,10 @@ def epsilon_closure(nfa, states):
     
     while stack:
         current_state = stack.pop()
-        if 'ε' in nfa.transitions[current_state]:
-            for state in nfa.transitions[current_state]['ε']:
+        transitions = nfa.transitions[current_state]
+        # re2nfa用None表示ε转换，手写的NFA则常用'ε'，两种写法都要处理
+        for epsilon in EPSILON_SYMBOLS:
+            for state in transitions.get(epsilon, ()):
                 if state not in closure:
                     closure.add(state)
                     stack.append(state)
@@ -132,7 +147,9 @@ def subset_construction(nfa):
     4. 确定接受状态：如果DFA的某个状态集合包含NFA的接受状态，则该状态为接受状态
     """
     dfa = DFA(nfa.alphabet)
-    start_closure = frozenset(epsilon_closure(nfa, {nfa.start_state}))
+    # 没有ε转换时ε-闭包就是集合本身
+    closure = (lambda nfa, states: states) if nfa.epsilon_free else epsilon_closure
+    start_closure = frozenset(closure(nfa, {nfa.start_state}))
     dfa.start_state = start_closure
     
     unprocessed_states = deque([start_closure])
@@ -143,7 +160,7 @@ def subset_construction(nfa):
         current_state = unprocessed_states.popleft()
         
         for symbol in nfa.alphabet - {'ε'}:  # 排除ε转换
-            next_states = frozenset(epsilon_closure(nfa, move(nfa, current_state, symbol)))
+            next_states = frozenset(closure(nfa, move(nfa, current_state, symbol)))
             
             if next_states and next_states not in dfa_states:
                 unprocessed_states.append(next_states)
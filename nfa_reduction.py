@@ -0,0 +1,193 @@
+"""
+确定化之前的NFA化简，得到接受相同语言、状态更少的re2nfa.NFA（没有ε转换）：
+1. 消除ε转换：q经ε-闭包中任一状态的符号转换直接到达目标；只保留起始状态和符号转换的目标
+2. 删除无用状态：从起始状态不可达，或无法到达接受状态的状态
+3. 合并互模拟的状态，交替进行直到状态数不再减少：
+   前向互模拟——接受性相同，且每个符号的后继落在相同的块中（未来的语言相同）
+   后向互模拟——是否为起始状态相同，且每个符号的前驱落在相同的块中（过去的语言相同）
+化简后丢弃捕获组标签，因此只用于判定是否匹配，不用于子匹配提取。
+"""
+from collections import deque
+
+from nfa2dfa import EPSILON_SYMBOLS
+from re2nfa import NFA
+
+
+def _closure(transitions, state):
+    closure = {state}
+    stack = [state]
+    while stack:
+        current = stack.pop()
+        for symbol in EPSILON_SYMBOLS:
+            for target in transitions.get(current, {}).get(symbol, ()):
+                if target not in closure:
+                    closure.add(target)
+                    stack.append(target)
+    return closure
+
+
+def remove_epsilon(nfa):
+    """消除ε转换，返回没有ε转换的NFA（状态号沿用原NFA）"""
+    if nfa.epsilon_free:
+        return nfa
+    transitions = {}
+    accept_states = set()
+    queue = deque([nfa.start_state])
+    seen = {nfa.start_state}
+    while queue:
+        state = queue.popleft()
+        trans = transitions[state] = {}
+        for member in _closure(nfa.transitions, state):
+            if member in nfa.accept_states:
+                accept_states.add(state)
+            for symbol, targets in nfa.transitions.get(member, {}).items():
+                if symbol in EPSILON_SYMBOLS:
+                    continue
+                trans.setdefault(symbol, set()).update(targets)
+                for target in targets - seen:
+                    seen.add(target)
+                    queue.append(target)
+    return NFA(nfa.start_state, set(nfa.alphabet), transitions, accept_states, epsilon_free=True)
+
+
+def trim(nfa):
+    """删除不可达或无法到达接受状态的状态（要求NFA没有ε转换）"""
+    predecessors = {state: set() for state in nfa.transitions}
+    for state, trans in nfa.transitions.items():
+        for targets in trans.values():
+            for target in targets:
+                predecessors.setdefault(target, set()).add(state)
+    reachable = {nfa.start_state}
+    stack = [nfa.start_state]
+    while stack:
+        for targets in nfa.transitions.get(stack.pop(), {}).values():
+            for target in targets - reachable:
+                reachable.add(target)
+                stack.append(target)
+    useful = nfa.accept_states & reachable
+    stack = list(useful)
+    while stack:
+        for source in predecessors.get(stack.pop(), ()):
+            if source not in useful and source in reachable:
+                useful.add(source)
+                stack.append(source)
+    useful.add(nfa.start_state)   # 起始状态总是保留（语言为空时只剩它）
+
+    transitions = {}
+    for state in useful:
+        trans = {}
+        for symbol, targets in nfa.transitions.get(state, {}).items():
+            kept = targets & useful
+            if kept:
+                trans[symbol] = kept
+        transitions[state] = trans
+    return NFA(nfa.start_state, set(nfa.alphabet), transitions, nfa.accept_states & useful,
+               epsilon_free=nfa.epsilon_free)
+
+
+def _refine(states, initial, neighbours):
+    """
+    划分细化：初始按initial划分，块内状态按 {(符号, 邻居所在块)} 细分直到稳定
+    只重新检查有成员的邻居换了块的那些块；拆分时最大的部分保留原块号
+    :param neighbours: 状态 -> [(符号, 邻居状态)]
+    :return: 状态 -> 块号
+    """
+    dependents = {state: [] for state in states}
+    for state in states:
+        for _, other in neighbours[state]:
+            dependents[other].append(state)
+
+    keys = {}
+    block = {}
+    members = {}
+    for state in states:
+        block[state] = keys.setdefault(initial(state), len(keys))
+        members.setdefault(block[state], []).append(state)
+
+    affected = set(members)
+    while affected:
+        moved = []
+        for current in affected:
+            groups = {}
+            for state in members[current]:
+                signature = frozenset((symbol, block[other]) for symbol, other in neighbours[state])
+                groups.setdefault(signature, []).append(state)
+            if len(groups) == 1:
+                continue
+            parts = sorted(groups.values(), key=len, reverse=True)
+            members[current] = parts[0]
+            for part in parts[1:]:
+                new_block = len(members)
+                members[new_block] = part
+                for state in part:
+                    block[state] = new_block
+                moved.extend(part)
+        affected = {block[dependent] for state in moved for dependent in dependents[state]}
+    return block
+
+
+def merge_bisimilar(nfa, backward=False):
+    """
+    合并前向（或后向）互模拟的状态
+    前向合并时块内状态接受性相同；后向合并时块内任一状态接受则整个块接受
+    """
+    states = list(nfa.transitions)
+    edges = {state: [] for state in states}
+    for state, trans in nfa.transitions.items():
+        for symbol, targets in trans.items():
+            for target in targets:
+                if backward:
+                    edges[target].append((symbol, state))
+                else:
+                    edges[state].append((symbol, target))
+    if backward:
+        initial = lambda state: state == nfa.start_state
+    else:
+        initial = lambda state: state in nfa.accept_states
+    block = _refine(states, initial, edges)
+    if len(set(block.values())) == len(states):
+        return nfa
+
+    transitions = {}
+    for state, trans in nfa.transitions.items():
+        merged = transitions.setdefault(block[state], {})
+        for symbol, targets in trans.items():
+            merged.setdefault(symbol, set()).update(block[target] for target in targets)
+    accept_states = {block[state] for state in nfa.accept_states}
+    return NFA(block[nfa.start_state], set(nfa.alphabet), transitions, accept_states,
+               epsilon_free=nfa.epsilon_free)
+
+
+def _renumber(nfa):
+    """按从起始状态出发的BFS顺序（符号排序）把状态重新编号为0..n-1"""
+    numbering = {nfa.start_state: 0}
+    queue = deque([nfa.start_state])
+    while queue:
+        trans = nfa.transitions[queue.popleft()]
+        for symbol in sorted(trans):
+            for target in sorted(trans[symbol]):
+                if target not in numbering:
+                    numbering[target] = len(numbering)
+                    queue.append(target)
+    transitions = {numbering[state]: {symbol: {numbering[t] for t in targets}
+                                      for symbol, targets in nfa.transitions[state].items()}
+                   for state in sorted(numbering, key=numbering.get)}
+    accept_states = {numbering[state] for state in nfa.accept_states if state in numbering}
+    return NFA(0, set(nfa.alphabet), transitions, accept_states, epsilon_free=nfa.epsilon_free)
+
+
+def reduce_nfa(nfa):
+    """
+    化简NFA：消除ε转换、删除无用状态、交替合并前向与后向互模拟的状态
+    :return: 接受相同语言的新NFA，状态按BFS顺序编号为0..n-1，epsilon_free为True
+    """
+    reduced = trim(remove_epsilon(nfa))
+    backward = False
+    # 合并后得到的NFA在该方向上已经稳定，只需换方向继续；两个方向都稳定时结束
+    unchanged = 0
+    while unchanged < 2:
+        merged = merge_bisimilar(reduced, backward)
+        unchanged = unchanged + 1 if merged is reduced else 1
+        reduced = merged
+        backward = not backward
+    return _renumber(reduced)
@@ -0,0 +1,91 @@
+"""
+并行子集构造：
+1. 按BFS层（frontier）推进，每一层的子集切分成若干批交给进程池
+2. 工作进程在初始化时收到一份只读的NFA，对每个子集一次遍历按符号分组计算move，
+   再求ε-闭包，返回 {符号: 目标子集}
+3. 协调进程按批次顺序、符号顺序合并结果，去重并为新子集编号，
+   因此输出与工作进程数无关，且与subset_construction得到的DFA完全相同
+"""
+import multiprocessing
+
+from nfa2dfa import DFA, EPSILON_SYMBOLS, epsilon_closure
+
+_worker_nfa = None
+
+
+def _init_worker(nfa):
+    """进程池初始化：保存只读NFA"""
+    global _worker_nfa
+    _worker_nfa = nfa
+
+
+def successors(nfa, subset):
+    """一次遍历子集中所有状态，按符号计算 ε-closure(move(subset, symbol))，省略空目标"""
+    moves = {}
+    for state in subset:
+        for symbol, targets in nfa.transitions[state].items():
+            if symbol not in EPSILON_SYMBOLS and symbol in nfa.alphabet:
+                moves.setdefault(symbol, set()).update(targets)
+    if nfa.epsilon_free:
+        return {symbol: frozenset(targets) for symbol, targets in moves.items()}
+    return {symbol: frozenset(epsilon_closure(nfa, targets)) for symbol, targets in moves.items()}
+
+
+def _expand_batch(batch):
+    """工作进程：计算一批子集的所有后继"""
+    return [successors(_worker_nfa, subset) for subset in batch]
+
+
+def _batches(frontier, count):
+    """把一层子集均匀切分为最多count批，保持原有顺序"""
+    size = max(1, -(-len(frontier) // count))
+    return [frontier[i:i + size] for i in range(0, len(frontier), size)]
+
+
+def parallel_subset_construction(nfa, workers=None, batches_per_worker=4, min_parallel=8):
+    """
+    并行子集构造，结果与subset_construction相同（DFA状态为NFA状态的frozenset）
+    :param workers: 工作进程数，默认为CPU核数；为1时不创建进程池
+    :param batches_per_worker: 每层为每个工作进程切分的批数，越大负载越均衡、通信越多
+    :param min_parallel: 一层子集数少于该值时在协调进程内直接计算
+    :return: (DFA, 按编号排列的子集列表)
+    """
+    workers = workers or multiprocessing.cpu_count()
+    dfa = DFA(nfa.alphabet)
+    start = frozenset(epsilon_closure(nfa, {nfa.start_state}))
+    dfa.start_state = start
+    numbering = {start: 0}
+    subsets = [start]
+    frontier = [start]
+
+    pool = None
+    if workers > 1:
+        pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(nfa,))
+    try:
+        while frontier:
+            if pool is not None and len(frontier) >= min_parallel:
+                chunks = _batches(frontier, workers * batches_per_worker)
+                results = [r for chunk in pool.map(_expand_batch, chunks) for r in chunk]
+            else:
+                results = [successors(nfa, subset) for subset in frontier]
+
+            next_frontier = []
+            for subset, trans in zip(frontier, results):
+                dfa.transitions[subset] = {}
+                for symbol in sorted(trans):
+                    target = trans[symbol]
+                    if target not in numbering:
+                        numbering[target] = len(subsets)
+                        subsets.append(target)
+                        next_frontier.append(target)
+                    dfa.transitions[subset][symbol] = target
+            frontier = next_frontier
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    for subset in subsets:
+        if subset & nfa.accept_states:
+            dfa.accept_states.add(subset)
+    return dfa, subsets
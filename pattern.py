@@ -0,0 +1,145 @@
+"""
+编译接口：把正则表达式编译为最小化DFA，并在匹配前使用必需字面量预过滤
+    pattern = compile_pattern('(a|b)*abb')
+    pattern.fullmatch('aabb')
+    pattern.stats()
+    compile_pattern(r'[a-z]+\\d{2,4}', syntax='extended')   # 扩展语法，见regex_parser
+
+    rules = compile_rules(['foo', 'ba(r|z)', '(a|b)*abb'])    # 规则集合，纯字面量规则走Aho–Corasick
+    rules.match('baz')                                         # 完整匹配的规则号集合
+"""
+from acceleration import AcceleratedDFA
+from aho_corasick import AhoCorasick
+from incremental_dfa import IncrementalDFA
+from nfa_reduction import reduce_nfa
+from re2nfa import regex_to_postfix, postfix_to_nfa
+from nfa2dfa import subset_construction
+from DFA2minimal import hopcroft_minimization
+from glushkov import postfix_to_glushkov
+from prefilter import Prefilter, finite_language, required_literals
+from regex_parser import parse_to_postfix
+
+# 可选的NFA构造方法：后缀表达式 -> NFA
+CONSTRUCTIONS = {
+    'thompson': postfix_to_nfa,
+    'glushkov': postfix_to_glushkov,
+}
+
+# 可选的正则语法：正则表达式 -> 后缀表达式
+SYNTAXES = {
+    'basic': regex_to_postfix,
+    'extended': parse_to_postfix,
+}
+
+
+class Pattern:
+    def __init__(self, regex, dfa, prefilter=None, matcher=None):
+        """
+        :param regex: 原始正则表达式
+        :param dfa: 最小化DFA
+        :param prefilter: 可选的Prefilter，为None时所有输入都交给DFA
+        :param matcher: 可选的匹配器（如AcceleratedDFA），为None时直接使用dfa.accepts
+        """
+        self.regex = regex
+        self.dfa = dfa
+        self.prefilter = prefilter
+        self.matcher = matcher if matcher is not None else dfa
+        self.automaton_runs = 0
+
+    def fullmatch(self, string):
+        """判断string是否与正则表达式完全匹配"""
+        if self.prefilter is not None and not self.prefilter.check(string):
+            return False
+        self.automaton_runs += 1
+        return self.matcher.accepts(string)
+
+    def stats(self):
+        """
+        返回匹配统计：输入数、进入自动机的输入数、预过滤各条件的拒绝数与命中率，
+        以及状态加速跳过的输入字符比例（未启用加速时为0）
+        """
+        prefilter = self.prefilter
+        return {
+            'inputs': prefilter.inputs if prefilter else self.automaton_runs,
+            'automaton_runs': self.automaton_runs,
+            'rejected': dict(prefilter.rejected) if prefilter else {},
+            'hit_rate': prefilter.hit_rate if prefilter else 0.0,
+            'skip_ratio': getattr(self.matcher, 'skip_ratio', 0.0),
+        }
+
+
+def compile_pattern(regex, prefilter=True, construction='thompson', syntax='basic', reduce=False,
+                    accelerate=False):
+    """
+    编译正则表达式
+    :param prefilter: 是否启用必需字面量预过滤（没有可用的字面量时自动关闭）
+    :param construction: NFA构造方法，见CONSTRUCTIONS
+    :param syntax: 正则语法，见SYNTAXES；扩展语法的错误以RegexSyntaxError报告
+    :param reduce: 确定化之前是否用reduce_nfa化简NFA
+    :param accelerate: 是否用AcceleratedDFA匹配，在自环状态上批量跳过输入
+    """
+    if construction not in CONSTRUCTIONS:
+        raise ValueError(f"未知的NFA构造方法: {construction}，可选: {', '.join(CONSTRUCTIONS)}")
+    if syntax not in SYNTAXES:
+        raise ValueError(f"未知的正则语法: {syntax}，可选: {', '.join(SYNTAXES)}")
+    postfix = SYNTAXES[syntax](regex)
+    nfa = CONSTRUCTIONS[construction](postfix)
+    if reduce:
+        nfa = reduce_nfa(nfa)
+    dfa = hopcroft_minimization(subset_construction(nfa)).minimize()
+    literal_filter = None
+    if prefilter:
+        literal_filter = Prefilter(required_literals(postfix))
+        if not literal_filter.useful:
+            literal_filter = None
+    matcher = AcceleratedDFA(dfa) if accelerate else None
+    return Pattern(regex, dfa, literal_filter, matcher)
+
+
+class RuleSet:
+    def __init__(self, literals, automaton, literal_rules, regex_rules):
+        """
+        :param literals: 纯字面量规则的AhoCorasick，没有这类规则时为None
+        :param automaton: 其余规则的IncrementalDFA，没有这类规则时为None
+        :param literal_rules: 走Aho–Corasick的规则号列表
+        :param regex_rules: 走DFA的规则号列表，下标即IncrementalDFA中的规则号
+        """
+        self.literals = literals
+        self.automaton = automaton
+        self.literal_rules = literal_rules
+        self.regex_rules = regex_rules
+
+    def match(self, string):
+        """返回完整匹配string的规则号集合（与IncrementalDFA.match相同）"""
+        matched = self.literals.match(string) if self.literals is not None else set()
+        if self.automaton is not None:
+            matched |= {self.regex_rules[rule] for rule in self.automaton.match(string)}
+        return matched
+
+
+def compile_rules(patterns, syntax='basic', literal_fast_path=True):
+    """
+    编译规则集合，规则号按顺序从0开始分配
+    只能匹配有限个非空字符串的规则（如 abc、ab|cd、a{2}b）视为纯字面量规则，
+    用Aho–Corasick自动机处理，其余规则走 NFA -> 子集构造 的通用路径
+    :param syntax: 正则语法，见SYNTAXES
+    :param literal_fast_path: 为False时所有规则都走通用路径
+    """
+    if syntax not in SYNTAXES:
+        raise ValueError(f"未知的正则语法: {syntax}，可选: {', '.join(SYNTAXES)}")
+    patterns = list(patterns)
+    to_postfix = SYNTAXES[syntax]
+    keywords, literal_rules, regex_rules = [], [], []
+    for rule_id, regex in enumerate(patterns):
+        exact = finite_language(to_postfix(regex)) if literal_fast_path else None
+        if exact is not None and '' not in exact:
+            keywords.extend((rule_id, literal) for literal in exact)
+            literal_rules.append(rule_id)
+        else:
+            regex_rules.append(rule_id)
+
+    literals = AhoCorasick(keywords) if literal_rules else None
+    automaton = None
+    if regex_rules:
+        automaton = IncrementalDFA([patterns[rule_id] for rule_id in regex_rules], to_postfix)
+    return RuleSet(literals, automaton, literal_rules, regex_rules)
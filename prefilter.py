@@ -0,0 +1,248 @@
+"""
+必需字面量分析与预过滤：
+1. 在regex_to_postfix（或扩展语法parse_to_postfix）的后缀表达式上自底向上计算每个子表达式的
+   exact（可匹配的全部字符串，数量有限且较少时）、prefix（必需前缀）、
+   suffix（必需后缀）和musts（任何匹配都必然包含的子串）
+2. Prefilter在运行自动机之前用startswith/endswith/in（即str.find）快速拒绝不可能匹配的输入，
+   并统计各条件拒绝的输入数
+"""
+from collections import namedtuple
+from os.path import commonprefix
+
+from regex_parser import Charset, Repeat, OPTIONAL, expand_counted
+
+MAX_EXACT = 16  # exact集合的大小上限，超过时视为无限
+
+Literals = namedtuple('Literals', ['exact', 'prefix', 'suffix', 'musts'])
+
+
+def _common_suffix(strings):
+    return commonprefix([s[::-1] for s in strings])[::-1]
+
+
+def _longest_common_substring(strings):
+    """
+    求一组字符串的最长公共子串，同样长时取最短串中最靠左的一个
+    对长度二分查找（存在长为L的公共子串时必然存在更短的），每个长度用子串集合求交，
+    避免逐个枚举子串再用in检查的三次方代价
+    """
+    strings = list(strings)
+    if not strings:
+        return ''
+    shortest = min(strings, key=len)
+
+    def common(length):
+        candidates = {shortest[i:i + length] for i in range(len(shortest) - length + 1)}
+        for string in strings:
+            if not candidates:
+                break
+            if string is not shortest:
+                candidates &= {string[i:i + length] for i in range(len(string) - length + 1)}
+        return candidates
+
+    low, high = 0, len(shortest)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if common(middle):
+            low = middle
+        else:
+            high = middle - 1
+    if low == 0:
+        return ''
+    found = common(low)
+    return next(shortest[i:i + low] for i in range(len(shortest) - low + 1)
+                if shortest[i:i + low] in found)
+
+
+def _make(exact, prefix, suffix, musts):
+    """规整化：由exact推出前后缀与公共子串，去掉空串以及被更长必需串包含的串"""
+    if exact is not None and len(exact) > MAX_EXACT:
+        exact = None
+    if exact is not None and len(exact) == 1:
+        # 只有一个字符串时它本身就是前缀、后缀和必需串，长字面量的连接链走这条捷径
+        prefix = suffix = next(iter(exact))
+        musts = set(musts) | {prefix}
+    elif exact is not None:
+        prefix = commonprefix(list(exact))
+        suffix = _common_suffix(exact)
+        musts = set(musts) | {_longest_common_substring(exact)}
+    musts = set(musts) | {prefix, suffix}
+    musts.discard('')
+    maximal = {m for m in musts if not any(m != other and m in other for other in musts)}
+    return Literals(frozenset(exact) if exact is not None else None, prefix, suffix,
+                    frozenset(maximal))
+
+
+# ---- exact集合的运算：required_literals与finite_language共用，None表示无限或超过limit个 ----
+
+def _cap(exact, limit):
+    return None if exact is None or len(exact) > limit else exact
+
+
+def _exact_star(exact):
+    """x* 只有在 x ⊆ {ε} 时（∅* 与 ε*）才是有限语言"""
+    return {''} if exact is not None and exact <= {''} else None
+
+
+def _exact_concat(left, right, limit):
+    if left is None or right is None or len(left) * len(right) > limit:
+        return None
+    return {a + b for a in left for b in right}
+
+
+def _exact_alternate(left, right, limit):
+    if left is None or right is None:
+        return None
+    return _cap(left | right, limit)
+
+
+def _walk(postfix, symbols, star, repeat, concat, alternate, epsilon):
+    """
+    自底向上遍历后缀表达式（先展开计数重复），对每种记号调用对应的函数
+    :param symbols: 符号集合 -> 值（普通字符作为单元素集合传入）
+    :param epsilon: 空后缀表达式对应的值
+    """
+    stack = []
+    for char in expand_counted(postfix):
+        if isinstance(char, Repeat):
+            stack.append(repeat(stack.pop(), char))
+        elif isinstance(char, Charset):
+            stack.append(symbols(char))
+        elif isinstance(char, int):
+            continue
+        elif char == '*':
+            stack.append(star(stack.pop()))
+        elif char == '.':
+            right = stack.pop()
+            stack.append(concat(stack.pop(), right))
+        elif char == '|':
+            right = stack.pop()
+            stack.append(alternate(stack.pop(), right))
+        else:
+            stack.append(symbols({char}))
+    return stack.pop() if stack else epsilon
+
+
+# ---- 必需字面量分析 ----
+
+def _symbols(chars):
+    if len(chars) == 1:
+        char = next(iter(chars))
+        return _make({char}, char, char, {char})
+    return _make(set(chars), '', '', set())
+
+
+def _star(operand):
+    return _make(_exact_star(operand.exact), '', '', set())
+
+
+def _repeat(operand, token):
+    """x? 即 x|ε，x+ 即 x·x*"""
+    if token == OPTIONAL:
+        return _alternate(operand, _make({''}, '', '', set()))
+    return _concat(operand, _star(operand))
+
+
+def _concat(left, right):
+    exact = _exact_concat(left.exact, right.exact, MAX_EXACT)
+    if left.exact is not None:
+        prefix = commonprefix([a + right.prefix for a in left.exact])
+    else:
+        prefix = left.prefix
+    if right.exact is not None:
+        suffix = _common_suffix([left.suffix + b for b in right.exact])
+    else:
+        suffix = right.suffix
+    # 连接处：左边的必需后缀紧接着右边的必需前缀
+    musts = left.musts | right.musts | {left.suffix + right.prefix}
+    return _make(exact, prefix, suffix, musts)
+
+
+def _alternate(left, right):
+    exact = _exact_alternate(left.exact, right.exact, MAX_EXACT)
+    prefix = commonprefix([left.prefix, right.prefix])
+    suffix = _common_suffix([left.suffix, right.suffix])
+    # 两个分支各自的必需串的公共部分仍是必需的
+    musts = {_longest_common_substring([a, b]) for a in left.musts for b in right.musts}
+    return _make(exact, prefix, suffix, musts)
+
+
+def required_literals(postfix):
+    """
+    分析后缀表达式，返回Literals(exact, prefix, suffix, musts)
+    exact为None表示可匹配的字符串无限多或超过MAX_EXACT个
+    """
+    return _walk(postfix, _symbols, _star, _repeat, _concat, _alternate,
+                 _make({''}, '', '', set()))
+
+
+def finite_language(postfix, limit=MAX_EXACT):
+    """
+    只计算后缀表达式可匹配的全部字符串（即required_literals的exact）。
+    不做前后缀与必需子串分析：这部分分析在长字面量上很慢，
+    compile_rules需要对每条规则判断是否为有限语言，直接取required_literals(postfix).exact代价过高
+    :return: 字符串集合；可匹配的字符串无限多或超过limit个时返回None
+    """
+    def repeat(operand, token):
+        if token == OPTIONAL:
+            return _exact_alternate(operand, {''}, limit)
+        return _exact_concat(operand, _exact_star(operand), limit)
+
+    return _walk(postfix,
+                 lambda chars: _cap(set(chars), limit),
+                 _exact_star,
+                 repeat,
+                 lambda left, right: _exact_concat(left, right, limit),
+                 lambda left, right: _exact_alternate(left, right, limit),
+                 {''})
+
+
+class Prefilter:
+    def __init__(self, literals):
+        """
+        :param literals: required_literals的分析结果
+        """
+        self.literals = literals
+        self.exact = literals.exact
+        self.prefix = literals.prefix
+        self.suffix = literals.suffix
+        # 已被前缀或后缀覆盖的必需串不必再查找，其余按长度从长到短检查
+        self.musts = sorted((m for m in literals.musts
+                             if m not in literals.prefix and m not in literals.suffix),
+                            key=len, reverse=True)
+        self.inputs = 0
+        self.rejected = {'exact': 0, 'prefix': 0, 'suffix': 0, 'must': 0}
+
+    @property
+    def useful(self):
+        """是否存在可用于过滤的条件"""
+        return bool(self.exact is not None or self.prefix or self.suffix or self.musts)
+
+    def check(self, string):
+        """返回False表示string一定不匹配；返回True表示需要交给自动机判断"""
+        self.inputs += 1
+        if self.exact is not None:
+            if string not in self.exact:
+                self.rejected['exact'] += 1
+                return False
+            return True
+        if not string.startswith(self.prefix):
+            self.rejected['prefix'] += 1
+            return False
+        if not string.endswith(self.suffix):
+            self.rejected['suffix'] += 1
+            return False
+        for must in self.musts:
+            if must not in string:
+                self.rejected['must'] += 1
+                return False
+        return True
+
+    @property
+    def hit_rate(self):
+        """被预过滤直接拒绝、没有进入自动机的输入比例"""
+        return sum(self.rejected.values()) / self.inputs if self.inputs else 0.0
+
+    def reset_stats(self):
+        self.inputs = 0
+        self.rejected = dict.fromkeys(self.rejected, 0)
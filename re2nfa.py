@@ -1,5 +1,9 @@
+from regex_parser import Charset, Repeat, OPTIONAL, PLUS, expand_counted
+
+
 class NFA:
-    def __init__(self, start_state, alphabet, transitions, accept_states):
+    def __init__(self, start_state, alphabet, transitions, accept_states, tags=None,
+                 epsilon_free=False):
         """
         NFA类的构造函数
         :param start_state: 起始状态号
@@ -8,12 +12,17 @@ class NFA:
             {当前状态: {输入符号: {目标状态集合}}}
             其中输入符号可以是None，表示ε转换(不需要输入即可转换)
         :param accept_states: 接受状态集合
+        :param tags: 带标签的ε转换，格式为 {(源状态, 目标状态): 标签号}
+            第k个捕获组的开始标签为2(k-1)，结束标签为2(k-1)+1
+        :param epsilon_free: 构造方保证没有ε转换时为True，匹配和子集构造可以跳过ε-闭包
         """
         self.start_state = start_state
         alphabet.discard('ε')  # 移除'ε'符号
         self.alphabet = alphabet
         self.transitions = transitions
         self.accept_states = accept_states
+        self.tags = tags if tags is not None else {}
+        self.epsilon_free = epsilon_free
     
     def accepts(self, string):
         # 初始化当前状态集为 ε-闭包
@@ -29,6 +38,8 @@ class NFA:
         return any(state in self.accept_states for state in current_states)
     
     def _epsilon_closure(self, states):
+        if self.epsilon_free:
+            return set(states)
         stack = list(states)
         closure = set(states)
         
@@ -41,7 +52,11 @@ class NFA:
         
         return closure
 
-def regex_to_postfix(regex):
+def regex_to_postfix(regex, capture=False):
+    """
+    将正则表达式转换为后缀表达式
+    :param capture: 为True时保留捕获组，返回记号列表，其中整数k表示"把栈顶子表达式作为第k个捕获组"
+    """
     # 首先处理隐式连接，插入.运算符
     output = []
     for i in range(len(regex)):
@@ -61,17 +76,24 @@ def regex_to_postfix(regex):
     postfix = []
     stack = []
     precedence = {'*': 3, '.': 2, '|': 1}
+    open_groups = []  # 尚未闭合的捕获组编号，按左括号出现顺序编号
+    group_count = 0
     
     for c in regex:
         if c.isalnum():
             postfix.append(c)
         elif c == '(':
             stack.append(c)
+            group_count += 1
+            open_groups.append(group_count)
         elif c == ')':
             while stack and stack[-1] != '(':
                 postfix.append(stack.pop())
             if stack:
                 stack.pop()  # 弹出'('
+                group = open_groups.pop()
+                if capture:
+                    postfix.append(group)
         else:
             while stack and stack[-1] != '(' and precedence.get(c, 0) <= precedence.get(stack[-1], 0):
                 postfix.append(stack.pop())
@@ -83,19 +105,68 @@ def regex_to_postfix(regex):
         else:
             stack.pop()
             
-    return ''.join(postfix)
+    return postfix if capture else ''.join(postfix)
 
 def postfix_to_nfa(postfix):
+    """
+    由后缀表达式构建Thompson NFA
+    :param postfix: regex_to_postfix的结果，或regex_parser.parse_to_postfix的记号列表
+        （其中的计数重复先由expand_counted展开为 ?、+）
+    """
     stack = []
     state_counter = 0
     
-    for char in postfix:
-        if char.isalnum():
+    for char in expand_counted(postfix):
+        if isinstance(char, Repeat):
+            # x? 增加绕过x的ε转换，x+ 增加回到x开头的ε转换（不需要复制x）
+            if char not in (OPTIONAL, PLUS):
+                raise ValueError(f"未展开的计数重复: {char}")
+            nfa, counter = stack.pop()
+            new_start = counter
+            new_accept = counter + 1
+            
+            new_transitions = {**nfa.transitions}
+            new_transitions[new_start] = {None: {nfa.start_state}}
+            new_transitions[new_accept] = {}
+            if char == OPTIONAL:
+                new_transitions[new_start][None].add(new_accept)
+            
+            for accept in nfa.accept_states:
+                targets = new_transitions.setdefault(accept, {}).setdefault(None, set())
+                targets.add(new_accept)
+                if char == PLUS:
+                    targets.add(nfa.start_state)
+            
+            nfa = NFA(new_start, nfa.alphabet, new_transitions, {new_accept}, nfa.tags)
+            state_counter = counter + 2
+            stack.append((nfa, state_counter))
+            
+        elif isinstance(char, Charset):
+            # 字符集合：同一对状态之间每个字符一条边，空集合不接受任何字符
             transitions = {
-                state_counter: {char: {state_counter + 1}},
-                state_counter + 1: {}  # 确保每个状态都有转换表项
+                state_counter: {c: {state_counter + 1} for c in char},
+                state_counter + 1: {}
             }
-            nfa = NFA(state_counter, {char}, transitions, {state_counter + 1})
+            nfa = NFA(state_counter, set(char), transitions, {state_counter + 1})
+            state_counter += 2
+            stack.append((nfa, state_counter))
+            
+        elif isinstance(char, int):
+            # 捕获组：经开始标签进入子表达式，经结束标签离开
+            nfa, _ = stack.pop()
+            new_start = state_counter
+            new_accept = state_counter + 1
+            
+            new_transitions = {**nfa.transitions}
+            new_transitions[new_start] = {None: {nfa.start_state}}
+            new_transitions[new_accept] = {}
+            new_tags = {**nfa.tags, (new_start, nfa.start_state): 2 * (char - 1)}
+            
+            for accept in nfa.accept_states:
+                new_transitions.setdefault(accept, {}).setdefault(None, set()).add(new_accept)
+                new_tags[(accept, new_accept)] = 2 * (char - 1) + 1
+            
+            nfa = NFA(new_start, nfa.alphabet, new_transitions, {new_accept}, new_tags)
             state_counter += 2
             stack.append((nfa, state_counter))
             
@@ -113,7 +184,7 @@ def postfix_to_nfa(postfix):
                     new_transitions[accept] = {}
                 new_transitions[accept].setdefault(None, set()).update({nfa.start_state, new_accept})
             
-            nfa = NFA(new_start, nfa.alphabet, new_transitions, {new_accept})
+            nfa = NFA(new_start, nfa.alphabet, new_transitions, {new_accept}, nfa.tags)
             state_counter = counter + 2
             stack.append((nfa, state_counter))
             
@@ -127,7 +198,8 @@ def postfix_to_nfa(postfix):
                 new_transitions.setdefault(accept, {}).setdefault(None, set()).add(nfa2.start_state)
             
             new_alphabet = nfa1.alphabet | nfa2.alphabet
-            nfa = NFA(nfa1.start_state, new_alphabet, new_transitions, nfa2.accept_states)
+            nfa = NFA(nfa1.start_state, new_alphabet, new_transitions, nfa2.accept_states,
+                      {**nfa1.tags, **nfa2.tags})
             state_counter = max(counter1, counter2)
             stack.append((nfa, state_counter))
             
@@ -145,7 +217,17 @@ def postfix_to_nfa(postfix):
                 new_transitions.setdefault(accept, {}).setdefault(None, set()).add(new_accept)
             
             new_alphabet = nfa1.alphabet | nfa2.alphabet
-            nfa = NFA(new_start, new_alphabet, new_transitions, {new_accept})
+            nfa = NFA(new_start, new_alphabet, new_transitions, {new_accept},
+                      {**nfa1.tags, **nfa2.tags})
+            state_counter += 2
+            stack.append((nfa, state_counter))
+            
+        else:
+            transitions = {
+                state_counter: {char: {state_counter + 1}},
+                state_counter + 1: {}  # 确保每个状态都有转换表项
+            }
+            nfa = NFA(state_counter, {char}, transitions, {state_counter + 1})
             state_counter += 2
             stack.append((nfa, state_counter))
     
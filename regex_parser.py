@@ -0,0 +1,332 @@
+"""
+递归下降的正则表达式解析器（扩展语法），一次线性扫描生成语法树，再转换为后缀记号序列：
+    选择      a|b
+    连接      ab
+    重复      a*  a+  a?  a{m}  a{m,}  a{m,n}  a{,n}
+    分组      (a)  (?:a)
+    字符类    [abc]  [a-z]  [^abc]  .  \\d  \\w  \\s  \\D  \\W  \\S
+    转义      \\*  \\.  \\\\  \\n  \\t 等
+注意扩展语法中 . 表示除换行外的任意字符，与regex_to_postfix中显式连接运算符的含义不同；
+. 与取反字符类相对于给定的字母表（默认为string.printable）求补。
+字符 ε 在自动机中表示空转换，不能出现在字面量或字符类中（解析时抛出RegexSyntaxError）。
+
+语法树用元组表示：
+    ('empty',)                    空串
+    ('lit', c)                    单个字符
+    ('set', chars, negated)       字符类，negated为True时表示字母表中除chars以外的字符
+    ('cat', a, b, ...)            连接
+    ('alt', a, b, ...)            选择
+    ('repeat', node, min, max)    重复，max为None表示无上界
+    ('group', node, index)        第index个捕获组
+
+后缀记号序列在regex_to_postfix的基础上扩展了两种记号：
+    Charset  字符集合，匹配其中任意一个字符（与运算符同名的字符也用单元素Charset表示）
+    Repeat   计数重复，语法树和后缀序列中只保留一份子表达式，
+             构造自动机时才由expand_counted按需展开（导数构造可直接处理，无需展开）
+"""
+import re
+import string
+from collections import namedtuple
+
+DEFAULT_ALPHABET = frozenset(string.printable)
+EPSILON_CHAR = 'ε'  # 自动机中 'ε' 标记空转换（见nfa2dfa.EPSILON_SYMBOLS），不能作为字面量
+MAX_REPEAT = 1000   # 计数重复的上限
+OPERATORS = ('*', '.', '|')
+
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'f': '\f', 'v': '\v'}
+CLASS_ESCAPES = {
+    'd': frozenset(string.digits),
+    'w': frozenset(string.ascii_letters + string.digits + '_'),
+    's': frozenset(' \t\n\r\f\v'),
+}
+_COUNT = re.compile(r'\{(?=[\d,])(\d*)(,(\d*))?\}')   # 与Python re一致：{,n} 即 {0,n}，{} 不是重复
+
+
+class Charset(frozenset):
+    """后缀记号：匹配集合中任意一个字符，空集合不匹配任何字符"""
+
+    def __repr__(self):
+        return f"Charset({''.join(sorted(self))!r})"
+
+
+Repeat = namedtuple('Repeat', ['min', 'max'])
+OPTIONAL = Repeat(0, 1)
+PLUS = Repeat(1, None)
+EPSILON_TOKENS = (Charset(), '*')   # 空串记为 ∅*
+
+
+class RegexSyntaxError(ValueError):
+    def __init__(self, message, regex, position):
+        """
+        :param position: 出错位置（字符下标）
+        """
+        super().__init__(f"{message}（位置 {position}）: {regex!r}")
+        self.regex = regex
+        self.position = position
+
+
+class _Parser:
+    def __init__(self, regex):
+        self.regex = regex
+        self.pos = 0
+        self.group_count = 0
+
+    def error(self, message, position=None):
+        raise RegexSyntaxError(message, self.regex, self.pos if position is None else position)
+
+    def peek(self):
+        return self.regex[self.pos] if self.pos < len(self.regex) else None
+
+    def parse(self):
+        tree = self.parse_alt()
+        if self.pos < len(self.regex):
+            self.error("多余的右括号")
+        return tree
+
+    def parse_alt(self):
+        branches = [self.parse_cat()]
+        while self.peek() == '|':
+            self.pos += 1
+            branches.append(self.parse_cat())
+        return branches[0] if len(branches) == 1 else ('alt', *branches)
+
+    def parse_cat(self):
+        items = []
+        while self.peek() not in (None, '|', ')'):
+            items.append(self.parse_repeat())
+        if not items:
+            return ('empty',)
+        return items[0] if len(items) == 1 else ('cat', *items)
+
+    def parse_repeat(self):
+        node = self.parse_atom()
+        quantifier = self.parse_quantifier()
+        if quantifier is None:
+            return node
+        if self.parse_quantifier() is not None:
+            self.error("重复运算符不能连续使用", self.pos - 1)
+        low, high = quantifier
+        if high == 0:
+            return ('empty',)
+        if (low, high) == (1, 1):
+            return node
+        return ('repeat', node, low, high)
+
+    def parse_quantifier(self):
+        """解析重复运算符，返回(min, max)；不是重复运算符时返回None"""
+        char = self.peek()
+        if char in ('*', '+', '?'):
+            self.pos += 1
+            return {'*': (0, None), '+': (1, None), '?': (0, 1)}[char]
+        if char == '{':
+            match = _COUNT.match(self.regex, self.pos)
+            if match is None:
+                return None   # 不是合法的计数重复，{ 作为普通字符
+            start = self.pos
+            low = int(match.group(1) or 0)
+            if match.group(2) is None:
+                high = low
+            else:
+                high = int(match.group(3)) if match.group(3) else None
+            if low > MAX_REPEAT or (high is not None and high > MAX_REPEAT):
+                self.error(f"重复次数不能超过 {MAX_REPEAT}", start)
+            if high is not None and high < low:
+                self.error("重复次数的上界小于下界", start)
+            self.pos = match.end()
+            return low, high
+        return None
+
+    def parse_atom(self):
+        start = self.pos
+        char = self.regex[self.pos]
+        if char in ('*', '+', '?') or (char == '{' and _COUNT.match(self.regex, self.pos)):
+            self.error("重复运算符前面没有可重复的表达式")
+        self.pos += 1
+        if char == '(':
+            index = None
+            if self.regex.startswith('?:', self.pos):
+                self.pos += 2
+            elif self.peek() == '?':
+                self.error("不支持的分组语法")
+            else:
+                self.group_count += 1
+                index = self.group_count
+            node = self.parse_alt()
+            if self.peek() != ')':
+                self.error("缺少右括号", start)
+            self.pos += 1
+            return node if index is None else ('group', node, index)
+        if char == '[':
+            return self.parse_class(start)
+        if char == '.':
+            return ('set', frozenset('\n'), True)
+        if char == '\\':
+            return self.parse_escape(start)
+        self.check_char(char, start)
+        return ('lit', char)
+
+    def check_char(self, char, position):
+        if char == EPSILON_CHAR:
+            self.error(f"不支持字面量 {EPSILON_CHAR}（自动机中表示空转换）", position)
+
+    def parse_escape(self, start):
+        """解析反斜杠之后的转义，返回('lit', c)或('set', chars, negated)"""
+        char = self.peek()
+        if char is None:
+            self.error("反斜杠后缺少字符", start)
+        self.pos += 1
+        if char.lower() in CLASS_ESCAPES:
+            return ('set', CLASS_ESCAPES[char.lower()], char.isupper())
+        if char in ESCAPES:
+            return ('lit', ESCAPES[char])
+        if char.isalnum():
+            self.error(f"未知的转义 \\{char}", start)
+        return ('lit', char)
+
+    def parse_class(self, start):
+        negated = self.peek() == '^'
+        if negated:
+            self.pos += 1
+        chars = set()
+        first = True
+        while True:
+            char = self.peek()
+            if char is None:
+                self.error("字符类缺少右方括号", start)
+            if char == ']' and not first:
+                self.pos += 1
+                break
+            first = False
+            item_start = self.pos
+            low = self.parse_class_char()
+            if isinstance(low, frozenset):
+                chars |= low
+                continue
+            if self.peek() == '-' and self.pos + 1 < len(self.regex) and self.regex[self.pos + 1] != ']':
+                self.pos += 1
+                high = self.parse_class_char()
+                if isinstance(high, frozenset):
+                    self.error("字符范围的端点不能是字符类", item_start)
+                if high < low:
+                    self.error(f"字符范围 {low}-{high} 的顺序颠倒", item_start)
+                if low <= EPSILON_CHAR <= high:
+                    self.check_char(EPSILON_CHAR, item_start)
+                chars.update(chr(c) for c in range(ord(low), ord(high) + 1))
+            else:
+                chars.add(low)
+        return ('set', frozenset(chars), negated)
+
+    def parse_class_char(self):
+        """解析字符类中的一个字符，转义的字符类（如\\d）返回frozenset"""
+        start = self.pos
+        char = self.regex[self.pos]
+        self.pos += 1
+        if char != '\\':
+            self.check_char(char, start)
+            return char
+        node = self.parse_escape(start)
+        if node[0] == 'lit':
+            return node[1]
+        if node[2]:
+            self.error("字符类中不支持取反的转义", start)
+        return node[1]
+
+
+def parse(regex):
+    """解析扩展语法的正则表达式，返回语法树，语法错误时抛出RegexSyntaxError"""
+    return _Parser(regex).parse()
+
+
+def tree_to_postfix(tree, alphabet=None, capture=False):
+    """
+    把语法树转换为后缀记号列表
+    :param alphabet: . 与取反字符类求补所用的字母表，默认为DEFAULT_ALPHABET
+    :param capture: 为True时保留捕获组记号（整数k表示把栈顶子表达式作为第k个捕获组）
+    """
+    # ε 不能作为自动机的符号，求补结果中也不含 ε
+    alphabet = DEFAULT_ALPHABET if alphabet is None else frozenset(alphabet) - {EPSILON_CHAR}
+    postfix = []
+
+    def emit(node):
+        kind = node[0]
+        if kind == 'empty':
+            postfix.extend(EPSILON_TOKENS)
+        elif kind == 'lit':
+            postfix.append(Charset(node[1]) if node[1] in OPERATORS else node[1])
+        elif kind == 'set':
+            chars = alphabet - node[1] if node[2] else node[1]
+            if len(chars) == 1 and next(iter(chars)) not in OPERATORS:
+                postfix.append(next(iter(chars)))
+            else:
+                postfix.append(Charset(chars))
+        elif kind in ('cat', 'alt'):
+            # 子表达式依次输出后再输出运算符，得到右结合的连接/选择
+            for child in node[1:]:
+                emit(child)
+            postfix.extend(('.' if kind == 'cat' else '|') * (len(node) - 2))
+        elif kind == 'repeat':
+            emit(node[1])
+            postfix.append('*' if (node[2], node[3]) == (0, None) else Repeat(node[2], node[3]))
+        elif kind == 'group':
+            emit(node[1])
+            if capture:
+                postfix.append(node[2])
+        else:
+            raise ValueError(f"未知的语法树节点: {kind}")
+
+    emit(tree)
+    return postfix
+
+
+def parse_to_postfix(regex, alphabet=None, capture=False):
+    """解析扩展语法的正则表达式并转换为后缀记号列表"""
+    return tree_to_postfix(parse(regex), alphabet, capture)
+
+
+def expand_counted(postfix):
+    """
+    把后缀序列中的计数重复展开为只含 *、OPTIONAL(?)、PLUS(+) 的形式，
+    子表达式只复制必需的份数：
+        x{m,}   -> x…x x+        （共m份）
+        x{m,n}  -> x…x (x(x…)?)?  （共n份，后n-m份嵌套为可选）
+    不含计数重复时原样返回
+    """
+    if not any(isinstance(token, Repeat) and token not in (OPTIONAL, PLUS) for token in postfix):
+        return postfix
+    output = []
+    starts = []   # 栈中每个子表达式在output中的起始位置
+    for token in postfix:
+        if isinstance(token, Repeat):
+            start = starts[-1]
+            if token in (OPTIONAL, PLUS):
+                output.append(token)
+                continue
+            operand = output[start:]
+            del output[start:]
+            output.extend(_expand(operand, token.min, token.max))
+        elif isinstance(token, int) or token == '*':
+            output.append(token)
+        elif token in ('.', '|') and not isinstance(token, Charset):
+            starts.pop()
+            output.append(token)
+        else:
+            starts.append(len(output))
+            output.append(token)
+    return output
+
+
+def _expand(operand, low, high):
+    """展开operand{low,high}，返回后缀记号列表"""
+    tokens = []
+    for _ in range(low - 1 if high is None else low):
+        tokens += operand + (['.'] if tokens else [])
+    if high is None:
+        tail = operand + ['*' if low == 0 else PLUS]
+    else:
+        # 可选部分 (x(x(x)?)?)? 由内向外构造
+        tail = []
+        for _ in range(high - low):
+            tail = operand + (tail + ['.'] if tail else []) + [OPTIONAL]
+    if tokens and tail:
+        return tokens + tail + ['.']
+    return tokens or tail or list(EPSILON_TOKENS)
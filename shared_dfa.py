@@ -0,0 +1,159 @@
+"""
+在多个进程之间共享只读的DFA转换表：
+1. 所有者进程用SharedDFA.publish把DFA的稠密转换表、接受状态位图和符号表写入一块
+   multiprocessing.shared_memory，所有者负责close与unlink
+2. 工作进程用SharedDFA.attach按名字挂载，得到零拷贝的只读NumPy视图，只需close
+
+共享内存布局（小端）：
+    头部 64 字节：魔数、版本、行数（含死状态）、符号数、起始状态、符号表字节数
+    转换表：行数 × 符号数 个int32，最后一行是死状态
+    接受位图：行数 个uint8
+    符号表：UTF-8编码的JSON字符串列表，与转换表的列一一对应
+"""
+import json
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from nfa2dfa import DFA
+from moore_minimization import dense_table
+
+MAGIC = 0x44464131  # 'DFA1'
+VERSION = 1
+HEADER = np.dtype([('magic', '<u4'), ('version', '<u4'), ('rows', '<i8'), ('symbols', '<i8'),
+                   ('start', '<i8'), ('symbol_bytes', '<i8')])
+HEADER_SIZE = 64
+
+
+def _layout(rows, symbols):
+    """返回转换表、接受位图与符号表在共享内存中的偏移"""
+    table_offset = HEADER_SIZE
+    accept_offset = table_offset + rows * symbols * 4
+    symbols_offset = accept_offset + rows
+    return table_offset, accept_offset, symbols_offset
+
+
+def _attach_untracked(name):
+    """
+    挂载已有的共享内存但不向resource_tracker登记：
+    Python 3.13之前挂载方也会登记，工作进程退出时可能误报泄漏或重复删除
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class SharedDFA:
+    def __init__(self, shm, owner):
+        """请使用publish或attach创建"""
+        self._shm = shm
+        self.owner = owner
+        self.name = shm.name
+
+        header = np.frombuffer(shm.buf, dtype=HEADER, count=1)[0]
+        if header['magic'] != MAGIC or header['version'] != VERSION:
+            raise ValueError(f"共享内存 {shm.name} 中不是DFA表")
+        rows, width = int(header['rows']), int(header['symbols'])
+        table_offset, accept_offset, symbols_offset = _layout(rows, width)
+
+        self.start_state = int(header['start'])
+        self.dead_state = rows - 1
+        self.table = np.ndarray((rows, width), dtype='<i4', buffer=shm.buf, offset=table_offset)
+        self.accept = np.ndarray((rows,), dtype=np.uint8, buffer=shm.buf, offset=accept_offset)
+        if not owner:
+            self.table.flags.writeable = False
+            self.accept.flags.writeable = False
+        raw = bytes(shm.buf[symbols_offset:symbols_offset + int(header['symbol_bytes'])])
+        self.symbols = json.loads(raw.decode('utf-8'))
+        self.symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    @classmethod
+    def publish(cls, dfa, name=None):
+        """
+        把DFA写入新建的共享内存
+        :param name: 共享内存名，默认由系统生成
+        :return: 所有者SharedDFA，使用完毕后应调用unlink（或使用with语句）
+        """
+        table, states, symbols = dense_table(dfa)
+        rows, width = table.shape
+        encoded = json.dumps(symbols, ensure_ascii=False).encode('utf-8')
+        _, _, symbols_offset = _layout(rows, width)
+        size = symbols_offset + len(encoded)
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        try:
+            header = np.zeros(1, dtype=HEADER)
+            header[0] = (MAGIC, VERSION, rows, width, 0, len(encoded))
+            shm.buf[:HEADER.itemsize] = header.tobytes()
+            table_offset, accept_offset, _ = _layout(rows, width)
+            np.ndarray((rows, width), dtype='<i4', buffer=shm.buf, offset=table_offset)[:] = table
+            accept = np.ndarray((rows,), dtype=np.uint8, buffer=shm.buf, offset=accept_offset)
+            accept[:] = [state in dfa.accept_states for state in states] + [False]
+            shm.buf[symbols_offset:size] = encoded
+        except Exception:
+            shm.close()
+            shm.unlink()
+            raise
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """按名字挂载已发布的DFA，返回只读视图"""
+        return cls(_attach_untracked(name), owner=False)
+
+    def accepts(self, string):
+        """判断DFA是否接受给定字符串"""
+        index = self.symbol_index
+        table = self.table
+        state = self.start_state
+        for char in string:
+            column = index.get(char)
+            if column is None:
+                return False
+            state = table[state, column]
+            if state == self.dead_state:
+                return False
+        return bool(self.accept[state])
+
+    def to_dfa(self):
+        """还原为nfa2dfa.DFA（拷贝数据）"""
+        dfa = DFA(set(self.symbols))
+        dfa.start_state = self.start_state
+        for state, row in enumerate(self.table[:self.dead_state].tolist()):
+            dfa.transitions[state] = {symbol: target for symbol, target in zip(self.symbols, row)
+                                      if target != self.dead_state}
+            if self.accept[state]:
+                dfa.accept_states.add(state)
+        return dfa
+
+    def close(self):
+        """释放本进程中的视图与映射"""
+        if self._shm is None:
+            return
+        self.table = self.accept = None
+        self._shm.close()
+
+    def unlink(self):
+        """所有者关闭并删除共享内存"""
+        if not self.owner:
+            raise RuntimeError("只有发布者可以删除共享内存")
+        shm = self._shm
+        self.close()
+        if shm is not None:
+            shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.owner:
+            self.unlink()
+        else:
+            self.close()
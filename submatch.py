@@ -0,0 +1,182 @@
+"""
+捕获组（子匹配）提取：
+1. regex_to_postfix(capture=True) 与 postfix_to_nfa 把捕获组边界记录为带标签的ε转换
+2. TaggedDFA 按Laurikari的方法确定化：DFA状态是有序的 (NFA状态, 寄存器) 配置，
+   转换上附带寄存器操作，一次线性扫描输入即可得到各捕获组的位置
+3. 标签DFA状态数超过上限时，退回到 PikeVM 直接模拟带标签的NFA
+
+匹配语义与Python re.fullmatch相同：左分支优先、闭包贪婪，重复中的捕获组保留最后一次的值。
+唯一的差别是闭包的循环体可以匹配空串时（如((a)*)*），这里不会在末尾再做一次空的迭代，
+外层捕获组保留最后一次非空迭代的位置，而Python re会记录一次空匹配。
+ε转换目标按状态号升序遍历即为优先级顺序（postfix_to_nfa先构建左分支与循环体）。
+"""
+from re2nfa import regex_to_postfix, postfix_to_nfa
+
+UNSET = -1  # 标签尚未设置
+POS = -2    # 寄存器操作中表示"写入当前位置"
+
+
+class TDFATooLarge(Exception):
+    """标签DFA的状态数超过上限"""
+
+
+def _group_count(nfa):
+    return max(nfa.tags.values()) // 2 + 1 if nfa.tags else 0
+
+
+def tagged_closure(nfa, seeds, mark):
+    """
+    按优先级顺序计算带标签的ε-闭包
+    :param seeds: 有序的 (NFA状态, 标签值元组) 列表，越靠前优先级越高
+    :param mark: 经过标签转换时写入的值（模拟时为当前位置，确定化时为POS）
+    :return: 有序的 (NFA状态, 标签值元组) 列表，只保留有输入转换或接受的状态；
+             同一NFA状态只保留优先级最高的一个
+    """
+    result = []
+    seen = set()
+    # 深度优先，栈中逆序压入以保证先处理高优先级的分支
+    stack = list(reversed(seeds))
+    while stack:
+        state, values = stack.pop()
+        if state in seen:
+            continue
+        seen.add(state)
+        trans = nfa.transitions.get(state, {})
+        if state in nfa.accept_states or any(symbol is not None for symbol in trans):
+            result.append((state, values))
+        for target in sorted(trans.get(None, ()), reverse=True):
+            tag = nfa.tags.get((state, target))
+            if tag is None:
+                stack.append((target, values))
+            else:
+                stack.append((target, values[:tag] + (mark,) + values[tag + 1:]))
+    return result
+
+
+def _spans(values, group_count):
+    """把标签值转换为捕获组位置元组，未参与匹配的组为None"""
+    spans = []
+    for group in range(group_count):
+        start, end = values[2 * group], values[2 * group + 1]
+        spans.append((start, end) if start != UNSET and end != UNSET else None)
+    return tuple(spans)
+
+
+class PikeVM:
+    def __init__(self, nfa):
+        """直接模拟带标签NFA的匹配器，时间复杂度为 O(输入长度 × NFA状态数)"""
+        self.nfa = nfa
+        self.group_count = _group_count(nfa)
+
+    def fullmatch(self, string):
+        """
+        完整匹配string
+        :return: 各捕获组 (起始, 结束) 位置组成的元组，不匹配时返回None
+        """
+        nfa = self.nfa
+        initial = (UNSET,) * (2 * self.group_count)
+        threads = tagged_closure(nfa, [(nfa.start_state, initial)], 0)
+        for pos, char in enumerate(string, 1):
+            moved = []
+            for state, values in threads:
+                for target in sorted(nfa.transitions[state].get(char, ())):
+                    moved.append((target, values))
+            if not moved:
+                return None
+            threads = tagged_closure(nfa, moved, pos)
+        for state, values in threads:
+            if state in nfa.accept_states:
+                return _spans(values, self.group_count)
+        return None
+
+
+class TaggedDFA:
+    def __init__(self, nfa, max_states=1000):
+        """
+        对带标签NFA做Laurikari式确定化
+        :param max_states: DFA状态数上限，超过时抛出TDFATooLarge
+        """
+        self.group_count = _group_count(nfa)
+        self.transitions = {}  # {状态: {符号: (目标状态, 寄存器来源元组)}}
+        self.final = {}        # {接受状态: 标签对应的寄存器号元组}
+
+        initial = (UNSET,) * (2 * self.group_count)
+        configs = tagged_closure(nfa, [(nfa.start_state, initial)], POS)
+        key, self.initial_ops = self._canonicalize(configs)
+        self.start_state = 0
+
+        states = {key: 0}
+        worklist = [key]
+        while worklist:
+            key = worklist.pop()
+            state = states[key]
+            self.transitions[state] = {}
+            for nfa_state, regs in key:
+                if nfa_state in nfa.accept_states:
+                    self.final[state] = regs
+                    break
+
+            symbols = sorted({symbol for nfa_state, _ in key
+                              for symbol in nfa.transitions[nfa_state] if symbol is not None})
+            for symbol in symbols:
+                moved = [(target, regs) for nfa_state, regs in key
+                         for target in sorted(nfa.transitions[nfa_state].get(symbol, ()))]
+                target_key, ops = self._canonicalize(tagged_closure(nfa, moved, POS))
+                if target_key not in states:
+                    if len(states) >= max_states:
+                        raise TDFATooLarge(f"标签DFA状态数超过上限 {max_states}")
+                    states[target_key] = len(states)
+                    worklist.append(target_key)
+                self.transitions[state][symbol] = (states[target_key], ops)
+
+    @staticmethod
+    def _canonicalize(configs):
+        """
+        按出现顺序把寄存器重新编号，使寄存器内容相同的配置对应同一个DFA状态
+        :return: (DFA状态键, 寄存器来源元组)；新寄存器i的值取自旧寄存器ops[i]，POS表示当前位置
+        """
+        renumber = {}
+        key = []
+        for nfa_state, values in configs:
+            regs = []
+            for value in values:
+                if value == UNSET:
+                    regs.append(UNSET)
+                    continue
+                if value not in renumber:
+                    renumber[value] = len(renumber)
+                regs.append(renumber[value])
+            key.append((nfa_state, tuple(regs)))
+        ops = tuple(sorted(renumber, key=renumber.get))
+        return tuple(key), ops
+
+    def fullmatch(self, string):
+        """
+        一次线性扫描完整匹配string
+        :return: 各捕获组 (起始, 结束) 位置组成的元组，不匹配时返回None
+        """
+        registers = [0 for _ in self.initial_ops]
+        state = self.start_state
+        for pos, char in enumerate(string, 1):
+            step = self.transitions[state].get(char)
+            if step is None:
+                return None
+            state, ops = step
+            registers = [pos if src == POS else registers[src] for src in ops]
+        regs = self.final.get(state)
+        if regs is None:
+            return None
+        return _spans(tuple(UNSET if r == UNSET else registers[r] for r in regs),
+                      self.group_count)
+
+
+def compile_submatch(regex, max_states=1000):
+    """
+    编译支持捕获组提取的匹配器，优先使用标签DFA，状态过多时退回Pike VM
+    :return: 带有fullmatch(string)方法的匹配器
+    """
+    nfa = postfix_to_nfa(regex_to_postfix(regex, capture=True))
+    try:
+        return TaggedDFA(nfa, max_states)
+    except TDFATooLarge:
+        return PikeVM(nfa)
@@ -0,0 +1,70 @@
+import random
+import unittest
+
+from acceleration import AcceleratedDFA, accelerable_states
+from fuzz_regex import random_cases, check_case
+from pattern import compile_pattern
+from test_regex_parser import random_extended
+
+
+class TestAcceleration(unittest.TestCase):
+    def test_find_state(self):
+        dfa = compile_pattern('a.*b', syntax='extended').dfa
+        accel = accelerable_states(dfa)
+        self.assertEqual(list(accel.values()), [('find', ('b',))])
+
+    def test_strip_state(self):
+        # 状态在a..h上自环，出口符号有i..m共5个，超过max_exits，改用lstrip
+        dfa = compile_pattern('[a-h]*[i-m]', syntax='extended').dfa
+        self.assertEqual(accelerable_states(dfa, max_exits=3)[dfa.start_state], ('strip', 'abcdefgh'))
+        matcher = AcceleratedDFA(dfa)
+        self.assertTrue(matcher.accepts('abcdefgh' * 100 + 'k'))
+        self.assertFalse(matcher.accepts('abcdefgh' * 100 + 'kk'))
+        self.assertFalse(matcher.accepts('abxd'))
+
+    def test_no_self_loop(self):
+        dfa = compile_pattern('abc').dfa
+        self.assertEqual(accelerable_states(dfa), {})
+
+    def test_counters(self):
+        matcher = AcceleratedDFA(compile_pattern('a.*b', syntax='extended').dfa)
+        self.assertTrue(matcher.accepts('a' + 'x' * 98 + 'b'))
+        self.assertFalse(matcher.accepts('a\nb'))    # 换行不在字母表中
+        self.assertFalse(matcher.accepts('aéb'))
+        stats = matcher.stats()
+        self.assertEqual(stats['inputs'], 3)
+        self.assertEqual(stats['chars'], 106)
+        self.assertEqual(stats['skipped'], 98)
+        self.assertEqual(stats['jumps'], 1)
+        self.assertAlmostEqual(matcher.skip_ratio, 98 / 106)
+        matcher.reset_stats()
+        self.assertEqual(matcher.skip_ratio, 0.0)
+
+    def test_pattern_stats(self):
+        pattern = compile_pattern('a.*b', syntax='extended', accelerate=True, prefilter=False)
+        self.assertTrue(pattern.fullmatch('axxxb'))
+        self.assertAlmostEqual(pattern.stats()['skip_ratio'], 3 / 5)
+        self.assertEqual(compile_pattern('ab').stats()['skip_ratio'], 0.0)
+
+    def test_same_as_dfa(self):
+        for _, regex, python_regex, inputs in random_cases(38, 300, 'abc', 5, inputs_per_case=10,
+                                                           max_length=12, max_repeat=8):
+            dfa = compile_pattern(regex).dfa
+            engines = {'find': AcceleratedDFA(dfa).accepts,
+                       'strip': AcceleratedDFA(dfa, max_exits=0).accepts}
+            case = check_case(regex, python_regex, inputs, engines)
+            self.assertEqual(case['divergences'], [], regex)
+
+    def test_extended_against_python_re(self):
+        rng = random.Random(5)
+        for _ in range(300):
+            regex = random_extended(rng, 4)
+            pattern = compile_pattern(regex, syntax='extended', accelerate=True)
+            inputs = [''.join(rng.choice('abc.*1-\nz') for _ in range(rng.randint(0, 12)))
+                      for _ in range(10)]
+            case = check_case(regex, regex, inputs, {'accelerated': pattern.fullmatch})
+            self.assertEqual(case['divergences'], [], regex)
+
+
+if __name__ == '__main__':
+    unittest.main()
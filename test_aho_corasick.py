@@ -0,0 +1,67 @@
+import random
+import unittest
+
+from aho_corasick import AhoCorasick
+from fuzz_regex import random_regex_tree, render_regex
+from incremental_dfa import IncrementalDFA
+from pattern import compile_rules
+
+
+def random_literals(rng, count, alphabet='abc', max_length=5):
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(1, max_length)))
+            for _ in range(count)]
+
+
+class TestAhoCorasick(unittest.TestCase):
+    def test_scan_classic(self):
+        automaton = AhoCorasick(enumerate(['he', 'she', 'his', 'hers']))
+        self.assertEqual(automaton.scan('ushers'), [(1, 4, 1), (2, 4, 0), (2, 6, 3)])
+        self.assertEqual(automaton.states, 10)
+        self.assertEqual(len(automaton.table), automaton.states * automaton.width)
+
+    def test_scan_against_naive(self):
+        rng = random.Random(36)
+        for _ in range(50):
+            literals = random_literals(rng, 20)
+            automaton = AhoCorasick(enumerate(literals))
+            text = ''.join(rng.choice('abcd') for _ in range(60))
+            expected = sorted((start, start + len(literal), rule_id)
+                              for rule_id, literal in enumerate(literals)
+                              for start in range(len(text)) if text.startswith(literal, start))
+            self.assertEqual(sorted(automaton.scan(text)), expected)
+
+    def test_match_same_as_dfa(self):
+        rng = random.Random(7)
+        literals = random_literals(rng, 200) + ['abcabc', 'abcabc']   # 重复的字面量属于两个规则
+        automaton = AhoCorasick(enumerate(literals))
+        dfa = IncrementalDFA(literals)
+        for string in random_literals(rng, 500, 'abcd', 6) + ['', 'abcabc']:
+            self.assertEqual(automaton.match(string), dfa.match(string), string)
+        self.assertEqual(automaton.match('abcabc'), {200, 201})
+
+    def test_empty_literal(self):
+        with self.assertRaises(ValueError):
+            AhoCorasick([(0, '')])
+
+    def test_rule_set(self):
+        rng = random.Random(3)
+        rules = random_literals(rng, 100) + ['ab|cd', 'a(b|c)d']
+        rules += [render_regex(random_regex_tree(rng, 'abc', 3)) for _ in range(50)]
+        fast = compile_rules(rules)
+        general = compile_rules(rules, literal_fast_path=False)
+        self.assertIn(100, fast.literal_rules)    # 有限语言 ab|cd 也走Aho–Corasick
+        self.assertIn(101, fast.literal_rules)
+        self.assertIsNone(general.literals)
+        for string in random_literals(rng, 500, 'abcd', 7) + ['', 'cd', 'acd']:
+            self.assertEqual(fast.match(string), general.match(string), string)
+
+    def test_extended_syntax(self):
+        rules = compile_rules(['a\\.b', 'x{2}y', '[0-9]+'], syntax='extended')
+        self.assertEqual(rules.literal_rules, [0, 1])
+        self.assertEqual(rules.match('a.b'), {0})
+        self.assertEqual(rules.match('xxy'), {1})
+        self.assertEqual(rules.match('42'), {2})
+
+
+if __name__ == '__main__':
+    unittest.main()
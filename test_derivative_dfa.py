@@ -0,0 +1,81 @@
+import unittest
+
+from derivative_dfa import DerivativeCompiler, LazyDerivativeMatcher, derivative_dfa
+from DFA2minimal import hopcroft_minimization
+from fuzz_regex import random_cases, check_case
+from pattern import compile_pattern
+from regex_parser import parse_to_postfix
+
+
+class TestDerivativeDFA(unittest.TestCase):
+    def test_hash_consing(self):
+        compiler = DerivativeCompiler()
+        a, b, c = compiler.symbol('a'), compiler.symbol('b'), compiler.symbol('c')
+        self.assertEqual(compiler.alt(a, b), compiler.alt(b, a))
+        self.assertEqual(compiler.alt(a, compiler.alt(b, c)), compiler.alt(compiler.alt(a, b), c))
+        self.assertEqual(compiler.alt(a, a), a)
+        self.assertEqual(compiler.alt(a, compiler.empty), a)
+        self.assertEqual(compiler.cat(compiler.cat(a, b), c), compiler.cat(a, compiler.cat(b, c)))
+        self.assertEqual(compiler.cat(compiler.epsilon, a), a)
+        self.assertEqual(compiler.star(compiler.star(a)), compiler.star(a))
+        self.assertEqual(compiler.from_regex('(a|b)c'), compiler.from_regex('(b|a)c'))
+
+    def test_derivative_memoized(self):
+        compiler = DerivativeCompiler()
+        term = compiler.from_regex('(a|b)*abb')
+        first = compiler.derivative(term, 'a')
+        self.assertIn((term, 'a'), compiler.derivatives)
+        self.assertEqual(compiler.derivative(term, 'a'), first)
+        self.assertEqual(compiler.derivative(term, 'b'), term)
+
+    def test_nearly_minimal(self):
+        dfa = derivative_dfa('(a|b)*abb')
+        self.assertEqual(len(dfa.transitions), 4)
+        self.assertEqual(dfa.accept_states, {3})
+
+    def test_intersection(self):
+        compiler = DerivativeCompiler()
+        # 含有aa 且 以b结尾
+        term = compiler.intersect(compiler.from_regex('(a|b)*aa(a|b)*'), compiler.from_regex('(a|b)*b'))
+        dfa = compiler.to_dfa(term)
+        for string in ['aab', 'baab', 'abaabab']:
+            self.assertTrue(dfa.accepts(string), string)
+        for string in ['', 'aa', 'abab', 'aaba']:
+            self.assertFalse(dfa.accepts(string), string)
+
+    def test_max_states(self):
+        compiler = DerivativeCompiler()
+        with self.assertRaises(ValueError):
+            compiler.to_dfa(compiler.from_regex('(a|b)*a(a|b)(a|b)(a|b)'), max_states=8)
+
+    def test_long_literal(self):
+        """长连接链不应递归过深，左结合的后缀序列也应在线性时间内构造"""
+        regex = 'a' * 3000
+        self.assertEqual(len(derivative_dfa(regex).transitions), 3001)
+        matcher = LazyDerivativeMatcher(regex)
+        self.assertTrue(matcher.accepts(regex))
+        self.assertFalse(matcher.accepts(regex[1:]))
+        compiler = DerivativeCompiler()
+        dfa = compiler.to_dfa(compiler.from_postfix(parse_to_postfix('(' + 'ab' * 1500 + ')*')))
+        self.assertTrue(dfa.accepts('ab' * 3000))
+        self.assertFalse(dfa.accepts('ab' * 1500 + 'a'))
+
+    def test_against_python_re(self):
+        for _, regex, python_regex, inputs in random_cases(34, 300, 'abc', 5, explicit_dot=0.2,
+                                                           inputs_per_case=10, max_length=8):
+            engines = {'derivative': derivative_dfa(regex).accepts,
+                       'lazy': LazyDerivativeMatcher(regex).accepts}
+            case = check_case(regex, python_regex, inputs, engines)
+            self.assertEqual(case['divergences'], [], regex)
+
+    def test_same_minimal_dfa(self):
+        """最小化后应与子集构造路径得到相同的DFA"""
+        for _, regex, _, _ in random_cases(2, 100, 'abc', 5, inputs_per_case=0):
+            expected = compile_pattern(regex).dfa
+            minimal = hopcroft_minimization(derivative_dfa(regex)).minimize()
+            self.assertEqual((minimal.transitions, minimal.accept_states),
+                             (expected.transitions, expected.accept_states), regex)
+
+
+if __name__ == '__main__':
+    unittest.main()
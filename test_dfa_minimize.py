@@ -123,6 +123,25 @@ class TestDFAMinimization(unittest.TestCase):
         for state in min_dfa.transitions:
             self.assertEqual(len(min_dfa.transitions[state]), 2)  # 每个状态都应该有a和b两个转换
 
+    def test_partial_dfa(self):
+        """测试缺失转换（隐式死状态）的DFA不会被错误合并"""
+        # 接受 a|ab：状态1接受且能读b，状态2接受但没有任何转换
+        dfa = DFA({'a', 'b'})
+        dfa.start_state = 0
+        dfa.accept_states = {1, 2}
+        dfa.transitions = {
+            0: {'a': 1},
+            1: {'b': 2},
+            2: {}
+        }
+        
+        min_dfa = hopcroft_minimization(dfa).minimize()
+        print_dfa_info(min_dfa, "最小化后的部分DFA")
+        
+        self.assertEqual(len(min_dfa.transitions), 3)
+        for string, expected in [('a', True), ('ab', True), ('', False), ('abb', False), ('b', False)]:
+            self.assertEqual(min_dfa.accepts(string), expected, string)
+
 def run_tests():
     """运行所有测试用例"""
     # 创建测试套件
@@ -0,0 +1,59 @@
+import os
+import random
+import re
+import tempfile
+import unittest
+
+from fuzz_regex import (random_regex_tree, render_regex, sample_match, check_case,
+                        random_cases, fuzz, select_corpus, save_corpus, load_corpus)
+
+
+class TestFuzzRegex(unittest.TestCase):
+    def test_generated_regex_is_valid(self):
+        """生成的正则表达式在Python re中合法，采样串必然匹配"""
+        rng = random.Random(1)
+        for _ in range(200):
+            tree = random_regex_tree(rng, 'abc', 4)
+            python_regex = render_regex(tree)
+            for _ in range(5):
+                self.assertIsNotNone(re.fullmatch(python_regex, sample_match(rng, tree)))
+
+    def test_no_divergence(self):
+        """三种引擎与re.fullmatch的结果应当一致"""
+        cases = fuzz(iterations=150, seed=7, max_depth=4)
+        failed = [(case['regex'], case['divergences'][0]) for case in cases if case['divergences']]
+        self.assertEqual(failed, [])
+
+    def test_divergence_detected(self):
+        """故意出错的引擎应当被检测出来"""
+        engines = {'broken': lambda s: True}
+        case = check_case('ab', 'ab', ['ab', 'a'], engines=engines)
+        self.assertEqual([d['input'] for d in case['divergences']], ['a'])
+
+    def test_custom_oracle(self):
+        """oracle可以替换默认的re.fullmatch判定"""
+        case = check_case('ab', 'ab', ['ab', 'abc'], engines={'len': len}, oracle=lambda s: 2)
+        self.assertEqual([d['input'] for d in case['divergences']], ['abc'])
+
+    def test_random_cases(self):
+        """每个用例的后一半输入保证匹配"""
+        for _, _, python_regex, inputs in random_cases(5, 20, 'abc', inputs_per_case=6):
+            self.assertEqual(len(inputs), 6)
+            for string in inputs[3:]:
+                self.assertIsNotNone(re.fullmatch(python_regex, string))
+
+    def test_corpus_roundtrip(self):
+        """语料保存后可以原样读回，且包含结果不一致的用例"""
+        cases = fuzz(iterations=20, seed=3)
+        cases.append(check_case('ab', 'ab', ['a'], engines={'broken': lambda s: True}))
+        corpus = select_corpus(cases, top_k=2)
+        self.assertIn('divergence', {entry['reason'] for entry in corpus})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'corpus.json')
+            save_corpus(corpus, path)
+            self.assertEqual(load_corpus(path), corpus)
+
+
+if __name__ == '__main__':
+    unittest.main()
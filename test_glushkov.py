@@ -0,0 +1,55 @@
+import unittest
+
+from fuzz_regex import random_cases, check_case
+from glushkov import postfix_to_glushkov, BitParallelNFA
+from nfa2dfa import subset_construction
+from pattern import compile_pattern
+from re2nfa import NFA, regex_to_postfix
+
+
+class TestGlushkov(unittest.TestCase):
+    def test_structure(self):
+        nfa = postfix_to_glushkov(regex_to_postfix('(a|b)*abb'))
+        self.assertEqual(len(nfa.transitions), 6)  # 5个位置加初始状态
+        self.assertTrue(nfa.epsilon_free)
+        for trans in nfa.transitions.values():
+            self.assertNotIn(None, trans)
+        self.assertEqual(nfa.accept_states, {5})
+
+    def test_nullable(self):
+        nfa = postfix_to_glushkov(regex_to_postfix('a*b*'))
+        self.assertIn(0, nfa.accept_states)
+        self.assertTrue(nfa.accepts(''))
+        self.assertTrue(nfa.accepts('aab'))
+        self.assertFalse(nfa.accepts('ba'))
+
+    def test_bit_parallel_rejects_non_homogeneous(self):
+        nfa = NFA(0, {'a', 'b'}, {0: {'a': {1}}, 1: {'b': {1}}}, {1})
+        with self.assertRaises(ValueError):
+            BitParallelNFA(nfa)
+
+    def test_against_python_re(self):
+        for _, regex, python_regex, inputs in random_cases(8, 300, 'abc', 5, explicit_dot=0.2,
+                                                           inputs_per_case=10, max_length=8):
+            nfa = postfix_to_glushkov(regex_to_postfix(regex))
+            self.assertEqual(len(nfa.transitions), sum(c.isalnum() for c in regex) + 1)
+            engines = {'glushkov': nfa.accepts, 'bit_parallel': BitParallelNFA(nfa).accepts,
+                       'dfa': subset_construction(nfa).accepts}
+            case = check_case(regex, python_regex, inputs, engines)
+            self.assertEqual(case['divergences'], [], regex)
+
+    def test_same_minimal_dfa(self):
+        """两种构造方法最小化后应得到相同的DFA"""
+        for _, regex, _, _ in random_cases(1, 100, 'abc', 5, inputs_per_case=0):
+            thompson = compile_pattern(regex, construction='thompson').dfa
+            glushkov = compile_pattern(regex, construction='glushkov').dfa
+            self.assertEqual((thompson.transitions, thompson.accept_states),
+                             (glushkov.transitions, glushkov.accept_states), regex)
+
+    def test_unknown_construction(self):
+        with self.assertRaises(ValueError):
+            compile_pattern('ab', construction='brzozowski')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import itertools
+import random
+import re
+import unittest
+
+from fuzz_regex import random_regex_tree, render_regex
+from incremental_dfa import IncrementalDFA
+
+
+def all_strings(alphabet, max_length):
+    for length in range(max_length + 1):
+        for chars in itertools.product(alphabet, repeat=length):
+            yield ''.join(chars)
+
+
+class TestIncrementalDFA(unittest.TestCase):
+    def assertMatchesRules(self, inc, rules, alphabet='abc', max_length=4):
+        """逐个字符串对照Python re检查命中的规则号集合"""
+        min_dfa, min_tags = inc.minimize()
+        for string in all_strings(alphabet, max_length):
+            expected = {rule_id for rule_id, regex in rules.items() if re.fullmatch(regex, string)}
+            self.assertEqual(inc.match(string), expected, string)
+
+            state = min_dfa.start_state
+            for char in string:
+                state = min_dfa.transitions.get(state, {}).get(char)
+                if state is None:
+                    break
+            self.assertEqual(set(min_tags.get(state, ())), expected, string)
+
+    def test_basic_rules(self):
+        inc = IncrementalDFA(['ab', 'a*', '(a|b)c'])
+        self.assertEqual(inc.match('ab'), {0})
+        self.assertEqual(inc.match(''), {1})
+        self.assertEqual(inc.match('aa'), {1})
+        self.assertEqual(inc.match('bc'), {2})
+        self.assertEqual(inc.match('c'), set())
+
+    def test_add_and_remove(self):
+        inc = IncrementalDFA(['ab'])
+        rule_id = inc.add('a(b|c)')
+        self.assertEqual(inc.match('ab'), {0, rule_id})
+        inc.remove(0)
+        self.assertEqual(inc.match('ab'), {rule_id})
+        inc.remove(rule_id)
+        self.assertEqual(inc.match('ab'), set())
+
+    def test_remove_unknown_rule(self):
+        """删除不存在的规则号时抛出KeyError，且规则集合与DFA保持不变"""
+        inc = IncrementalDFA(['ab', 'cd'])
+        transitions = dict(inc.dfa.transitions)
+        with self.assertRaises(KeyError):
+            inc.update(remove=[0, 99])
+        self.assertEqual(inc.dfa.transitions, transitions)
+        self.assertEqual(set(inc.rule_states), {0, 1})
+        self.assertMatchesRules(inc, {0: 'ab', 1: 'cd'}, alphabet='abcd')
+        inc.remove(0)
+        self.assertMatchesRules(inc, {1: 'cd'}, alphabet='abcd')
+
+    def test_random_updates(self):
+        """随机增删规则后，结果应与Python re一致"""
+        rng = random.Random(11)
+        inc = IncrementalDFA()
+        rules = {}
+        for _ in range(15):
+            if rules and rng.random() < 0.4:
+                rule_id = rng.choice(sorted(rules))
+                inc.remove(rule_id)
+                del rules[rule_id]
+            else:
+                regex = render_regex(random_regex_tree(rng, 'abc', 3))
+                rules[inc.add(regex)] = regex
+            self.assertMatchesRules(inc, rules)
+
+    def test_same_subsets_as_rebuild(self):
+        """增量更新并回收后的子集应与完整重建完全相同"""
+        inc = IncrementalDFA(['abc', '(a|b)*c', 'ba*'])
+        new_rules = inc.update(add=['ab*', 'cc'])
+        inc.update(remove=[1, new_rules[0]])
+        inc.collect_garbage()
+        incremental = dict(inc.dfa.transitions)
+        incremental_tags = dict(inc.tags)
+        inc.rebuild()
+        self.assertEqual(incremental, inc.dfa.transitions)
+        self.assertEqual(incremental_tags, inc.tags)
+
+
+if __name__ == '__main__':
+    unittest.main()
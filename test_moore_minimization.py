@@ -0,0 +1,64 @@
+import random
+import unittest
+
+import numpy as np
+
+from nfa2dfa import DFA, subset_construction
+from re2nfa import regex_to_postfix, postfix_to_nfa
+from DFA2minimal import hopcroft_minimization
+from fuzz_regex import random_regex_tree, render_regex
+from moore_minimization import moore_minimization, refine_blocks, compress_alphabet
+
+
+def same_dfa(a, b):
+    return (a.start_state, a.transitions, a.accept_states) == \
+           (b.start_state, b.transitions, b.accept_states)
+
+
+class TestMooreMinimization(unittest.TestCase):
+    def test_refine_blocks(self):
+        # 状态0、1、2都能循环到自身，3为死状态
+        table = np.array([[1, 3], [0, 3], [2, 3], [3, 3]])
+        block, rounds = refine_blocks(table, np.array([1, 1, 1, 0]))
+        self.assertEqual(len(set(block[:3].tolist())), 1)
+        self.assertNotEqual(block[0], block[3])
+        self.assertGreaterEqual(rounds, 1)
+
+    def test_compress_alphabet(self):
+        table = np.array([[1, 1, 0], [0, 0, 1]])
+        self.assertEqual(compress_alphabet(table).shape, (2, 2))
+
+    def test_same_as_hopcroft_regex(self):
+        """对正则表达式得到的DFA，结果应与Hopcroft完全相同"""
+        rng = random.Random(3)
+        for _ in range(200):
+            regex = render_regex(random_regex_tree(rng, 'abc', 5))
+            dfa = subset_construction(postfix_to_nfa(regex_to_postfix(regex)))
+            self.assertTrue(same_dfa(moore_minimization(dfa).minimize(),
+                                     hopcroft_minimization(dfa).minimize()), regex)
+
+    def test_same_as_hopcroft_random(self):
+        """对随机完全DFA，结果应与Hopcroft完全相同"""
+        rng = random.Random(5)
+        for n in (1, 5, 50, 300):
+            dfa = DFA({'a', 'b', 'c'})
+            dfa.start_state = 0
+            dfa.transitions = {s: {c: rng.randrange(n) for c in 'abc'} for s in range(n)}
+            dfa.accept_states = {s for s in range(n) if rng.random() < 0.3}
+            self.assertTrue(same_dfa(moore_minimization(dfa).minimize(),
+                                     hopcroft_minimization(dfa).minimize()))
+
+    def test_labels(self):
+        dfa = DFA({'a'})
+        dfa.start_state = 0
+        dfa.accept_states = {1, 2}
+        dfa.transitions = {0: {'a': 1}, 1: {'a': 2}, 2: {'a': 2}}
+        labels = {1: 'x', 2: 'y'}
+        self.assertEqual(len(moore_minimization(dfa).minimize().transitions), 2)
+        self.assertEqual(len(moore_minimization(dfa, labels).minimize().transitions), 3)
+        self.assertTrue(same_dfa(moore_minimization(dfa, labels).minimize(),
+                                 hopcroft_minimization(dfa, labels).minimize()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -94,6 +94,19 @@ class TestNFA2DFA(unittest.TestCase):
         self.assertTrue(any(frozenset(['q0', 'q1', 'q2']) == state 
                           for state in epsilon_dfa.accept_states))
 
+    def test_none_epsilon(self):
+        """测试re2nfa风格的NFA（用None表示ε转换）"""
+        nfa = NFA(
+            start_state=0,
+            alphabet={'a'},
+            transitions={0: {None: {1}}, 1: {'a': {2}}, 2: {None: {0}}},
+            accept_states={2}
+        )
+        self.assertEqual(epsilon_closure(nfa, {2}), {0, 1, 2})
+        dfa = subset_construction(nfa)
+        self.assertTrue(dfa.accepts('aa'))
+        self.assertFalse(dfa.accepts(''))
+
     def test_visualization(self):
         """测试NFA和DFA的可视化功能"""
         # 测试NFA可视化
@@ -0,0 +1,77 @@
+import unittest
+
+from DFA2minimal import hopcroft_minimization
+from fuzz_regex import random_cases, check_case
+from glushkov import postfix_to_glushkov
+from nfa2dfa import subset_construction
+from nfa_reduction import reduce_nfa, remove_epsilon, trim, merge_bisimilar
+from pattern import compile_pattern
+from re2nfa import NFA, regex_to_postfix, postfix_to_nfa
+from regex_parser import Charset, parse_to_postfix
+
+
+class TestNFAReduction(unittest.TestCase):
+    def test_classic(self):
+        reduced = reduce_nfa(postfix_to_nfa(regex_to_postfix('(a|b)*abb')))
+        self.assertTrue(reduced.epsilon_free)
+        self.assertEqual(len(reduced.transitions), 4)
+        self.assertEqual(reduced.start_state, 0)
+        for trans in reduced.transitions.values():
+            self.assertNotIn(None, trans)
+
+    def test_remove_epsilon(self):
+        nfa = remove_epsilon(postfix_to_nfa(regex_to_postfix('a*b*')))
+        self.assertTrue(nfa.epsilon_free)
+        self.assertIn(nfa.start_state, nfa.accept_states)
+        self.assertTrue(nfa.accepts('aab'))
+        self.assertFalse(nfa.accepts('ba'))
+
+    def test_trim(self):
+        nfa = NFA(0, {'a', 'b'}, {0: {'a': {1}, 'b': {2}}, 1: {}, 2: {'b': {2}}, 3: {'a': {1}}}, {1},
+                  epsilon_free=True)
+        self.assertEqual(set(trim(nfa).transitions), {0, 1})
+
+    def test_empty_language(self):
+        reduced = reduce_nfa(postfix_to_nfa([Charset(), 'a', '.']))
+        self.assertEqual(reduced.transitions, {0: {}})
+        self.assertEqual(reduced.accept_states, set())
+
+    def test_backward_merge(self):
+        """ab|ac：两个a之后的状态未来不同，不能前向合并，但过去相同，可以后向合并"""
+        nfa = trim(remove_epsilon(postfix_to_nfa(regex_to_postfix('ab|ac'))))
+        forward = merge_bisimilar(nfa)
+        self.assertEqual(len(forward.transitions), 4)
+        self.assertEqual(len(merge_bisimilar(forward, backward=True).transitions), 3)
+
+    def test_not_larger_than_glushkov(self):
+        for _, regex, _, _ in random_cases(9, 200, 'abc', 5, inputs_per_case=0):
+            postfix = regex_to_postfix(regex)
+            reduced = reduce_nfa(postfix_to_nfa(postfix))
+            self.assertLessEqual(len(reduced.transitions), len(postfix_to_glushkov(postfix).transitions))
+
+    def test_against_python_re(self):
+        for _, regex, python_regex, inputs in random_cases(37, 300, 'abc', 5, explicit_dot=0.2,
+                                                           inputs_per_case=10, max_length=8):
+            reduced = reduce_nfa(postfix_to_nfa(regex_to_postfix(regex)))
+            engines = {'reduced': reduced.accepts, 'dfa': subset_construction(reduced).accepts}
+            case = check_case(regex, python_regex, inputs, engines)
+            self.assertEqual(case['divergences'], [], regex)
+
+    def test_same_minimal_dfa(self):
+        for _, regex, _, _ in random_cases(4, 100, 'abc', 5, inputs_per_case=0):
+            nfa = postfix_to_nfa(regex_to_postfix(regex))
+            expected = hopcroft_minimization(subset_construction(nfa)).minimize()
+            minimal = compile_pattern(regex, reduce=True).dfa
+            self.assertEqual((minimal.transitions, minimal.accept_states),
+                             (expected.transitions, expected.accept_states), regex)
+
+    def test_extended_syntax(self):
+        nfa = postfix_to_nfa(parse_to_postfix('(ab){2,4}c?'))
+        reduced = reduce_nfa(nfa)
+        self.assertLess(len(reduced.transitions), len(nfa.transitions))
+        for string in ['abab', 'ababc', 'abababab', 'ab', 'ababababab', 'ababc']:
+            self.assertEqual(reduced.accepts(string), nfa.accepts(string), string)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import random
+import unittest
+
+from fuzz_regex import random_regex_tree, render_regex
+from incremental_dfa import IncrementalDFA
+from nfa2dfa import NFA, subset_construction
+from parallel_subset import parallel_subset_construction
+from re2nfa import regex_to_postfix, postfix_to_nfa
+
+
+class TestParallelSubset(unittest.TestCase):
+    def test_same_as_subset_construction(self):
+        rng = random.Random(2)
+        for _ in range(100):
+            regex = render_regex(random_regex_tree(rng, 'abc', 5))
+            nfa = postfix_to_nfa(regex_to_postfix(regex))
+            expected = subset_construction(nfa)
+            dfa, subsets = parallel_subset_construction(nfa, workers=1)
+            self.assertEqual(dfa.start_state, expected.start_state)
+            self.assertEqual(dfa.transitions, expected.transitions)
+            self.assertEqual(dfa.accept_states, expected.accept_states)
+            self.assertEqual(subsets[0], dfa.start_state)
+
+    def test_handwritten_epsilon(self):
+        nfa = NFA(start_state='q0', alphabet={'a', 'b', 'ε'}, accept_states={'q2'},
+                  transitions={'q0': {'a': ['q1'], 'ε': ['q2']}, 'q1': {'b': ['q2']}, 'q2': {}})
+        dfa, _ = parallel_subset_construction(nfa, workers=1)
+        self.assertEqual(dfa.transitions, subset_construction(nfa).transitions)
+
+    def test_independent_of_workers(self):
+        """工作进程数不同时，子集编号和DFA都应完全相同"""
+        rules = ['abc', '(a|b)*c', 'ba*', 'c(a|b)(a|b)', 'cab*a']
+        nfa = IncrementalDFA(rules).nfa
+        results = [parallel_subset_construction(nfa, workers=w, min_parallel=1) for w in (1, 2, 3)]
+        for dfa, subsets in results[1:]:
+            self.assertEqual(subsets, results[0][1])
+            self.assertEqual(dfa.transitions, results[0][0].transitions)
+
+
+if __name__ == '__main__':
+    unittest.main()
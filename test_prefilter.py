@@ -0,0 +1,72 @@
+import unittest
+
+from fuzz_regex import random_cases, check_case
+from re2nfa import regex_to_postfix
+from prefilter import required_literals, finite_language, Prefilter
+from pattern import compile_pattern
+
+
+def literals(regex):
+    return required_literals(regex_to_postfix(regex))
+
+
+class TestPrefilter(unittest.TestCase):
+    def test_prefix_suffix(self):
+        result = literals('ab(c|d)*ef')
+        self.assertIsNone(result.exact)
+        self.assertEqual(result.prefix, 'ab')
+        self.assertEqual(result.suffix, 'ef')
+
+    def test_exact(self):
+        result = literals('a(b|c)d')
+        self.assertEqual(result.exact, {'abd', 'acd'})
+        self.assertEqual(result.prefix, 'a')
+        self.assertEqual(result.suffix, 'd')
+
+    def test_inner_must(self):
+        """两个分支都包含的子串是必需的"""
+        result = literals('(xabcx|yabcy)z*')
+        self.assertIn('abc', result.musts)
+        self.assertEqual(result.prefix, '')
+
+    def test_long_branches(self):
+        """长分支的公共子串分析不能按子串逐个枚举"""
+        result = literals('(' + 'x' * 300 + 'abc' + 'y' * 300 + '|' + 'z' * 400 + 'abc)w*')
+        self.assertIn('abc', result.musts)
+        self.assertEqual(result.prefix, '')
+        self.assertEqual(result.suffix, '')
+        self.assertEqual(literals('(' + 'a' * 600 + '|' + 'b' * 600 + ')c*').musts, frozenset())
+
+    def test_star_has_no_literal(self):
+        result = literals('(a|b)*')
+        self.assertFalse(Prefilter(result).useful)
+
+    def test_finite_language(self):
+        """finite_language与required_literals的exact一致"""
+        for _, regex, _, _ in random_cases(12, 300, 'ab', 4, inputs_per_case=0):
+            postfix = regex_to_postfix(regex)
+            exact = required_literals(postfix).exact
+            self.assertEqual(finite_language(postfix), None if exact is None else set(exact))
+
+    def test_stats(self):
+        pattern = compile_pattern('ab(c|d)*ef')
+        for string in ['abef', 'xbef', 'abcx', 'abcdef', 'cdcd']:
+            pattern.fullmatch(string)
+        stats = pattern.stats()
+        self.assertEqual(stats['inputs'], 5)
+        self.assertEqual(stats['automaton_runs'], 2)
+        self.assertEqual(stats['rejected']['prefix'], 2)
+        self.assertEqual(stats['rejected']['suffix'], 1)
+        self.assertAlmostEqual(stats['hit_rate'], 0.6)
+
+    def test_never_rejects_match(self):
+        """预过滤不能拒绝真正匹配的输入"""
+        for _, regex, python_regex, inputs in random_cases(4, 300, 'abcd', 5, inputs_per_case=10,
+                                                           noise=''):
+            engines = {'prefiltered': compile_pattern(regex).fullmatch}
+            case = check_case(regex, python_regex, inputs, engines)
+            self.assertEqual(case['divergences'], [], regex)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import random
+import time
+import unittest
+
+from derivative_dfa import DerivativeCompiler
+from fuzz_regex import check_case
+from glushkov import postfix_to_glushkov, BitParallelNFA
+from nfa2dfa import subset_construction
+from pattern import compile_pattern
+from re2nfa import postfix_to_nfa
+from regex_parser import (Charset, Repeat, RegexSyntaxError, expand_counted, parse,
+                          parse_to_postfix)
+
+
+def random_extended(rng, depth):
+    """生成随机的扩展语法正则表达式（同时也是合法的Python正则表达式）"""
+    if depth == 0 or rng.random() < 0.3:
+        return rng.choice(['a', 'b', 'c', r'\.', r'\*', '[ab]', '[^a]', '[a-c]', '.', r'\d', '-'])
+    kind = rng.choice(['cat', 'cat', 'alt', 'repeat', 'group'])
+    if kind == 'cat':
+        return random_extended(rng, depth - 1) + random_extended(rng, depth - 1)
+    if kind == 'alt':
+        return random_extended(rng, depth - 1) + '|' + random_extended(rng, depth - 1)
+    if kind == 'group':
+        return '(' + random_extended(rng, depth - 1) + ')'
+    low = rng.randint(0, 2)
+    quantifier = rng.choice(['*', '+', '?', f'{{{low}}}', f'{{{low},}}', f'{{{low},{low + rng.randint(0, 2)}}}'])
+    return '(' + random_extended(rng, depth - 1) + ')' + quantifier
+
+
+class TestRegexParser(unittest.TestCase):
+    def test_tree(self):
+        self.assertEqual(parse('ab|c'), ('alt', ('cat', ('lit', 'a'), ('lit', 'b')), ('lit', 'c')))
+        self.assertEqual(parse('a+'), ('repeat', ('lit', 'a'), 1, None))
+        self.assertEqual(parse('(a){2,5}'), ('repeat', ('group', ('lit', 'a'), 1), 2, 5))
+        self.assertEqual(parse('(?:a)?'), ('repeat', ('lit', 'a'), 0, 1))
+        self.assertEqual(parse('[a-c\\d]'), ('set', frozenset('abc0123456789'), False))
+        self.assertEqual(parse('[^.]'), ('set', frozenset('.'), True))
+        self.assertEqual(parse('a{1}'), ('lit', 'a'))
+        self.assertEqual(parse('a{0}'), ('empty',))
+        self.assertEqual(parse('a{'), ('cat', ('lit', 'a'), ('lit', '{')))
+        self.assertEqual(parse(''), ('empty',))
+
+    def test_postfix_tokens(self):
+        self.assertEqual(parse_to_postfix('a\\*b'), ['a', Charset('*'), 'b', '.', '.'])
+        self.assertEqual(parse_to_postfix('[^b]', alphabet='abc'), [Charset('ac')])
+        self.assertEqual(parse_to_postfix('(a)*', capture=True), ['a', 1, '*'])
+
+    def test_errors(self):
+        cases = [('a)', 1), ('(ab', 0), ('*a', 0), ('a**', 2), ('[ab', 0), ('a{3,2}', 1),
+                 ('[z-a]', 1), ('a\\', 1), ('\\q', 0), ('(?=a)', 1), ('a{1001}', 1)]
+        for regex, position in cases:
+            with self.assertRaises(RegexSyntaxError, msg=regex) as context:
+                parse(regex)
+            self.assertEqual(context.exception.position, position, regex)
+            self.assertIsInstance(context.exception, ValueError)
+
+    def test_epsilon_char(self):
+        """ε 在自动机中表示空转换，作为字面量时应报错，而不是被当作空串"""
+        for regex, position in [('xε', 1), ('[aε]', 2), ('[α-ω]', 1)]:
+            with self.assertRaises(RegexSyntaxError, msg=regex) as context:
+                compile_pattern(regex, syntax='extended', prefilter=False)
+            self.assertEqual(context.exception.position, position, regex)
+        self.assertEqual(parse_to_postfix('[^a]', alphabet='abε'), ['b'])
+
+    def test_compact_repetition(self):
+        postfix = parse_to_postfix('a{1000}')
+        self.assertEqual(postfix, ['a', Repeat(1000, 1000)])
+        self.assertEqual(expand_counted(postfix).count('a'), 1000)
+        # x{2,4} 展开为 x x (x(x)?)?，共4份
+        self.assertEqual(expand_counted(parse_to_postfix('a{2,4}')).count('a'), 4)
+        self.assertEqual(expand_counted(parse_to_postfix('a{2,}')).count('a'), 2)
+        # 导数构造直接处理计数重复
+        compiler = DerivativeCompiler()
+        dfa = compiler.to_dfa(compiler.from_postfix(parse_to_postfix('a{3,5}')))
+        self.assertEqual(len(dfa.transitions), 6)
+
+    def test_empty_lower_bound(self):
+        """与Python re一致：{,n} 即 {0,n}，{,} 即 *，{} 是普通字符"""
+        self.assertEqual(parse('a{,3}'), ('repeat', ('lit', 'a'), 0, 3))
+        self.assertEqual(parse('a{,}'), ('repeat', ('lit', 'a'), 0, None))
+        inputs = ['', 'a', 'aaa', 'aaaa', 'b', 'aab', 'a{}', 'a{,3}']
+        for regex in ['a{,3}', 'a{,}', 'a{}', 'a{,3}b']:
+            engines = {'pattern': compile_pattern(regex, syntax='extended').fullmatch}
+            self.assertEqual(check_case(regex, regex, inputs, engines)['divergences'], [], regex)
+
+    def test_linear_parse(self):
+        regex = '(a|b)c[de]f{2}' * 2000
+        start = time.perf_counter()
+        parse(regex)
+        elapsed_large = time.perf_counter() - start
+        start = time.perf_counter()
+        parse(regex[:len(regex) // 10])
+        elapsed_small = time.perf_counter() - start
+        self.assertLess(elapsed_large, max(elapsed_small, 1e-3) * 30)
+
+    def test_against_python_re(self):
+        rng = random.Random(35)
+        compiler = DerivativeCompiler()
+        for _ in range(300):
+            regex = random_extended(rng, 4)
+            postfix = parse_to_postfix(regex)
+            nfa = postfix_to_nfa(postfix)
+            glushkov = postfix_to_glushkov(postfix)
+            engines = {'nfa': nfa.accepts, 'dfa': subset_construction(nfa).accepts,
+                       'glushkov': glushkov.accepts, 'bit_parallel': BitParallelNFA(glushkov).accepts,
+                       'derivative': compiler.to_dfa(compiler.from_postfix(postfix)).accepts,
+                       'pattern': compile_pattern(regex, syntax='extended').fullmatch}
+            inputs = [''.join(rng.choice('abc.*1-\n') for _ in range(rng.randint(0, 6)))
+                      for _ in range(15)]
+            case = check_case(regex, regex, inputs, engines)
+            self.assertEqual(case['divergences'], [], regex)
+
+    def test_unknown_syntax(self):
+        with self.assertRaises(ValueError):
+            compile_pattern('ab', syntax='posix')
+
+
+if __name__ == '__main__':
+    unittest.main()
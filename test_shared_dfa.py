@@ -0,0 +1,50 @@
+import multiprocessing
+import unittest
+
+from pattern import compile_pattern
+from shared_dfa import SharedDFA
+
+
+def _worker_accepts(name, strings):
+    """在工作进程中挂载共享DFA并匹配"""
+    shared = SharedDFA.attach(name)
+    try:
+        return [shared.accepts(s) for s in strings]
+    finally:
+        shared.close()
+
+
+class TestSharedDFA(unittest.TestCase):
+    def setUp(self):
+        self.dfa = compile_pattern('(a|b)*abb', prefilter=False).dfa
+        self.strings = ['abb', 'aabb', 'ab', '', 'babb', 'abc']
+        self.expected = [self.dfa.accepts(s) for s in self.strings]
+
+    def test_attach_in_process(self):
+        with SharedDFA.publish(self.dfa) as owner:
+            with SharedDFA.attach(owner.name) as shared:
+                self.assertEqual([shared.accepts(s) for s in self.strings], self.expected)
+                self.assertFalse(shared.table.flags.writeable)
+                with self.assertRaises(ValueError):
+                    shared.table[0, 0] = 1
+                with self.assertRaises(RuntimeError):
+                    shared.unlink()
+            restored = owner.to_dfa()
+            self.assertEqual([restored.accepts(s) for s in self.strings], self.expected)
+
+    def test_unlink(self):
+        owner = SharedDFA.publish(self.dfa)
+        name = owner.name
+        owner.unlink()
+        with self.assertRaises(FileNotFoundError):
+            SharedDFA.attach(name)
+
+    def test_worker_processes(self):
+        with SharedDFA.publish(self.dfa) as owner:
+            with multiprocessing.get_context('spawn').Pool(2) as pool:
+                results = pool.starmap(_worker_accepts, [(owner.name, self.strings)] * 2)
+        self.assertEqual(results, [self.expected] * 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
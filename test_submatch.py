@@ -0,0 +1,94 @@
+import re
+import unittest
+
+from fuzz_regex import random_cases, check_case
+from re2nfa import regex_to_postfix, postfix_to_nfa
+from submatch import TaggedDFA, PikeVM, TDFATooLarge, compile_submatch
+
+
+def render_with_groups(tree):
+    """渲染语法树，每个闭包和选择都写成捕获组"""
+    kind = tree[0]
+    if kind == 'lit':
+        return tree[1]
+    if kind == 'star':
+        return f'({render_with_groups(tree[1])})*'
+    if kind == 'alt':
+        return f'({render_with_groups(tree[1])}|{render_with_groups(tree[2])})'
+    return render_with_groups(tree[1]) + render_with_groups(tree[2])
+
+
+def nullable_star(tree):
+    """判断语法树中是否存在可以匹配空串的闭包循环体"""
+    def nullable(node):
+        if node[0] == 'lit':
+            return False
+        if node[0] == 'star':
+            return True
+        if node[0] == 'alt':
+            return nullable(node[1]) or nullable(node[2])
+        return nullable(node[1]) and nullable(node[2])
+
+    if tree[0] == 'lit':
+        return False
+    if tree[0] == 'star' and nullable(tree[1]):
+        return True
+    return any(nullable_star(child) for child in tree[1:])
+
+
+def python_spans(regex, string):
+    match = re.fullmatch(regex, string)
+    if match is None:
+        return None
+    return tuple(None if match.span(g) == (-1, -1) else match.span(g)
+                 for g in range(1, match.re.groups + 1))
+
+
+class TestSubmatch(unittest.TestCase):
+    def test_capture_postfix(self):
+        self.assertEqual(regex_to_postfix('(a|(b))*c', capture=True),
+                         ['a', 'b', 2, '|', 1, '*', 'c', '.'])
+        # 默认不保留捕获组，保持原有输出
+        self.assertEqual(regex_to_postfix('(a|(b))*c'), 'ab|*c.')
+
+    def test_tagged_edges_keep_language(self):
+        nfa = postfix_to_nfa(regex_to_postfix('(a|(b))*c', capture=True))
+        self.assertEqual(len(nfa.tags), 4)
+        self.assertTrue(nfa.accepts('abac'))
+        self.assertFalse(nfa.accepts('ab'))
+
+    def test_basic_groups(self):
+        matcher = compile_submatch('(a|b)*(c)')
+        self.assertIsInstance(matcher, TaggedDFA)
+        self.assertEqual(matcher.fullmatch('abc'), ((1, 2), (2, 3)))
+        self.assertEqual(matcher.fullmatch('c'), (None, (0, 1)))
+        self.assertIsNone(matcher.fullmatch('ab'))
+
+    def test_fallback_to_pike_vm(self):
+        nfa = postfix_to_nfa(regex_to_postfix('(a|b)*(ab)', capture=True))
+        with self.assertRaises(TDFATooLarge):
+            TaggedDFA(nfa, max_states=1)
+        matcher = compile_submatch('(a|b)*(ab)', max_states=1)
+        self.assertIsInstance(matcher, PikeVM)
+        self.assertEqual(matcher.fullmatch('bab'), ((0, 1), (1, 3)))
+
+    def test_against_python_re(self):
+        """标签DFA与Pike VM的捕获组位置应与Python re一致"""
+        checked = 0
+        for tree, _, _, inputs in random_cases(9, 400, 'abc', 4, inputs_per_case=10, max_length=6,
+                                               noise=''):
+            if nullable_star(tree):
+                continue
+            regex = render_with_groups(tree)
+            nfa = postfix_to_nfa(regex_to_postfix(regex, capture=True))
+            engines = {'tdfa': TaggedDFA(nfa, max_states=5000).fullmatch,
+                       'pike_vm': PikeVM(nfa).fullmatch}
+            case = check_case(regex, regex, inputs, engines,
+                              oracle=lambda string: python_spans(regex, string))
+            self.assertEqual(case['divergences'], [], regex)
+            checked += 1
+        self.assertGreater(checked, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()